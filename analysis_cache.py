@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Detector Analysis Cache
+
+Persistent SQLite cache of detector results keyed by file content hash,
+detector name and detector version, so CI rescans only pay for files
+whose content changed since the last run.
+"""
+
+import hashlib
+import pickle
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DEFAULT_CACHE_PATH = Path('.attrahere_cache') / 'analysis_cache.sqlite'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB of compressed results
+
+# Fraction of max_bytes kept after an eviction pass, so evictions are batched
+EVICTION_TARGET_RATIO = 0.9
+
+# Writes and access times are committed in one short transaction every
+# COMMIT_EVERY results or COMMIT_INTERVAL seconds, so concurrent scans sharing
+# a cache only wait briefly for each other and a killed scan keeps its results
+COMMIT_EVERY = 100
+COMMIT_INTERVAL = 2.0
+
+# Seconds a commit waits for another process's transaction before retrying later
+LOCK_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    content_hash TEXT NOT NULL,
+    detector TEXT NOT NULL,
+    version TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (content_hash, detector, version)
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access);
+"""
+
+_version_cache: Dict[str, str] = {}
+
+
+def content_hash(source: Union[str, bytes]) -> str:
+    """Return the cache key for a file's content"""
+    if isinstance(source, str):
+        source = source.encode('utf-8')
+    return hashlib.blake2b(source, digest_size=20).hexdigest()
+
+
+def detector_name(detector: Any) -> str:
+    """Return the stable name a detector is cached under"""
+    return type(detector).__name__
+
+
+def _package_digest(package: str) -> str:
+    """Hash every Python source file of a top-level package or module"""
+    module = sys.modules.get(package)
+    roots = [Path(root) for root in getattr(module, '__path__', [])]
+    if not roots and getattr(module, '__file__', None):
+        roots = [Path(module.__file__)]
+
+    digest = hashlib.blake2b(digest_size=20)
+    hashed = False
+    for root in roots:
+        files = sorted(root.rglob('*.py')) if root.is_dir() else [root]
+        for source_file in files:
+            try:
+                source = source_file.read_bytes()
+            except OSError:
+                continue
+            digest.update(str(source_file.relative_to(root.parent)).encode('utf-8'))
+            digest.update(content_hash(source).encode('ascii'))
+            hashed = True
+    return digest.hexdigest() if hashed else 'unversioned'
+
+
+def detector_version(detector: Any) -> str:
+    """
+    Return the version a detector's results are cached under.
+
+    Detectors may declare an explicit ``version`` attribute. Otherwise the
+    sources of the whole top-level package defining the detector class
+    (e.g. all of analysis_core) are hashed, so edits to a detector or to
+    shared code such as base_detector or ast_engine invalidate cached
+    results automatically.
+    """
+    explicit = getattr(detector, 'version', None)
+    if explicit is not None:
+        return str(explicit)
+
+    package = type(detector).__module__.split('.')[0]
+    if package not in _version_cache:
+        _version_cache[package] = _package_digest(package)
+    return _version_cache[package]
+
+
+class AnalysisCache:
+    """
+    Size-bounded, least-recently-used on-disk store of detector results.
+
+    Stored results and access times are buffered and committed in short
+    batches, so no write transaction stays open between calls and several
+    processes can share one cache file.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[Tuple[str, str, str], bytes] = {}
+        self._accessed: Dict[Tuple[str, str, str], float] = {}
+        self._last_commit = time.monotonic()
+
+        import sqlite3  # deferred so importing this module stays cheap for cache-less runs
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=LOCK_TIMEOUT)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+        row = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+        self._total_bytes = row[0]
+
+    def _key(self, file_hash: str, detector: Any) -> Tuple[str, str, str]:
+        return (file_hash, detector_name(detector), detector_version(detector))
+
+    def get(self, file_hash: str, detector: Any) -> Optional[List[Any]]:
+        """Return cached patterns for a file/detector pair, or None on a miss"""
+        key = self._key(file_hash, detector)
+        payload = self._pending.get(key)
+        if payload is None:
+            row = self._conn.execute(
+                'SELECT payload FROM results WHERE content_hash = ? AND detector = ? AND version = ?',
+                key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            payload = row[0]
+            self._accessed[key] = time.time()
+            self._maybe_commit()
+
+        self.hits += 1
+        return pickle.loads(zlib.decompress(payload))
+
+    def put(self, file_hash: str, detector: Any, patterns: List[Any]) -> None:
+        """Store the patterns a detector produced for a file"""
+        key = self._key(file_hash, detector)
+        self._pending[key] = zlib.compress(pickle.dumps(list(patterns), protocol=pickle.HIGHEST_PROTOCOL))
+        self._accessed.pop(key, None)
+        self._maybe_commit()
+
+    def _maybe_commit(self) -> None:
+        if (len(self._pending) >= COMMIT_EVERY or len(self._accessed) >= 10 * COMMIT_EVERY
+                or time.monotonic() - self._last_commit >= COMMIT_INTERVAL):
+            self.commit()
+
+    def commit(self) -> bool:
+        """
+        Write buffered results and access times in one transaction.
+
+        Returns False, keeping the buffer for the next attempt, if another
+        process held the database locked for longer than LOCK_TIMEOUT.
+        """
+        import sqlite3
+
+        self._last_commit = time.monotonic()
+        if not self._pending and not self._accessed:
+            return True
+
+        now = time.time()
+        try:
+            with self._conn:  # commits on success, rolls back on error
+                total_bytes = self._total_bytes
+                for key, payload in self._pending.items():
+                    previous = self._conn.execute(
+                        'SELECT size FROM results WHERE content_hash = ? AND detector = ? AND version = ?',
+                        key
+                    ).fetchone()
+                    total_bytes += len(payload) - (previous[0] if previous is not None else 0)
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                    [key + (payload, len(payload), now) for key, payload in self._pending.items()]
+                )
+                self._conn.executemany(
+                    'UPDATE results SET last_access = ? WHERE content_hash = ? AND detector = ? AND version = ?',
+                    [(accessed,) + key for key, accessed in self._accessed.items()]
+                )
+                if total_bytes > self.max_bytes:
+                    total_bytes = self._evict(total_bytes)
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            return False
+
+        self._total_bytes = total_bytes
+        self._pending.clear()
+        self._accessed.clear()
+        return True
+
+    def detect_patterns(self, detector: Any, analysis: Any, file_hash: str) -> List[Any]:
+        """Run ``detector.detect_patterns`` unless the result is already cached"""
+        patterns = self.get(file_hash, detector)
+        if patterns is None:
+            patterns = detector.detect_patterns(analysis)
+            self.put(file_hash, detector, patterns)
+        return patterns
+
+    def _evict(self, total_bytes: int) -> int:
+        """Drop least recently used entries until under the size target; return the new total"""
+        target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+        cursor = self._conn.execute(
+            'SELECT rowid, size FROM results ORDER BY last_access ASC'
+        )
+
+        doomed = []
+        for rowid, size in cursor:
+            if total_bytes <= target:
+                break
+            doomed.append((rowid,))
+            total_bytes -= size
+
+        self._conn.executemany('DELETE FROM results WHERE rowid = ?', doomed)
+        return total_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, stored size and hit/miss counters"""
+        self.commit()
+        entries = self._conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        return {
+            'entries': entries,
+            'total_bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def clear(self) -> None:
+        """Remove every cached result"""
+        self._pending.clear()
+        self._accessed.clear()
+        self._conn.execute('DELETE FROM results')
+        self._conn.commit()
+        self._conn.execute('VACUUM')
+        self._total_bytes = 0
+
+    def close(self) -> None:
+        """Flush pending writes and close the database"""
+        if not self.commit():
+            print(f"⚠️  Analysis cache {self.path} stayed locked; "
+                  f"{len(self._pending)} new results were not saved")
+        self._conn.close()
+
+    def __enter__(self) -> 'AnalysisCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the detector analysis cache")
+    parser.add_argument('--path', default=str(DEFAULT_CACHE_PATH), help="Cache database path")
+    parser.add_argument('--clear', action='store_true', help="Remove all cached results")
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"⚠️  No cache found at {args.path}")
+        sys.exit(0)
+
+    with AnalysisCache(args.path) as cache:
+        if args.clear:
+            cache.clear()
+            print(f"🧹 Cleared analysis cache: {args.path}")
+        else:
+            stats = cache.stats()
+            print(f"📦 Analysis cache: {args.path}")
+            print(f"  Entries: {stats['entries']}")
+            print(f"  Size: {stats['total_bytes'] / 1024 / 1024:.2f}MB "
+                  f"(limit: {stats['max_bytes'] / 1024 / 1024:.0f}MB)")
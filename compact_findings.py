@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Compact Finding Storage
+
+Columnar, array-backed storage for large numbers of detected ML
+anti-patterns. Pattern types, severities and file paths are interned,
+and the long message/explanation/suggested_fix prose is kept once per
+distinct text and only materialized when a finding's text is read.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List
+
+
+class _InternTable:
+    """Bidirectional string <-> id table"""
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: str) -> int:
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.ids[value] = value_id
+            self.values.append(value)
+        return value_id
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class CompactFinding:
+    """Lightweight view of one finding stored in a FindingStore"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'FindingStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def file_path(self) -> str:
+        return self._store._files.values[self._store._file_ids[self._index]]
+
+    @property
+    def pattern_type(self) -> str:
+        return self._store._types.values[self._store._type_ids[self._index]]
+
+    @property
+    def severity(self) -> str:
+        return self._store._severities.values[self._store._severity_ids[self._index]]
+
+    @property
+    def line_number(self) -> int:
+        return self._store._lines[self._index]
+
+    @property
+    def column(self) -> int:
+        return self._store._columns[self._index]
+
+    @property
+    def confidence(self) -> float:
+        return self._store._confidences[self._index]
+
+    @property
+    def message(self) -> str:
+        return self._store._texts.values[self._store._message_ids[self._index]]
+
+    @property
+    def explanation(self) -> str:
+        return self._store._texts.values[self._store._explanation_ids[self._index]]
+
+    @property
+    def suggested_fix(self) -> str:
+        return self._store._texts.values[self._store._fix_ids[self._index]]
+
+    def to_dict(self, include_text: bool = False) -> Dict[str, Any]:
+        """Return the finding as a dict, with the prose fields only on request"""
+        record = {
+            'file_path': self.file_path,
+            'pattern_type': self.pattern_type,
+            'severity': self.severity,
+            'line_number': self.line_number,
+            'column': self.column,
+            'confidence': self.confidence,
+        }
+        if include_text:
+            record['message'] = self.message
+            record['explanation'] = self.explanation
+            record['suggested_fix'] = self.suggested_fix
+        return record
+
+    def __repr__(self) -> str:
+        return (f"CompactFinding({self.pattern_type!r}, {self.severity!r}, "
+                f"{self.file_path}:{self.line_number}, confidence={self.confidence:.2f})")
+
+
+class FindingStore:
+    """
+    Append-only columnar store of MLAntiPattern findings.
+
+    Each finding costs roughly 30 bytes of typed arrays; strings are
+    shared through intern tables, so memory depends on how often text
+    repeats exactly. A million findings drawn from a few hundred distinct
+    messages stay in the tens of megabytes, but messages that embed
+    variable names or line numbers are mostly unique, and each unique
+    text costs its string plus an intern table entry: about 440MB per
+    million findings with typical message lengths.
+    """
+
+    def __init__(self):
+        self._files = _InternTable()
+        self._types = _InternTable()
+        self._severities = _InternTable()
+        self._texts = _InternTable()
+
+        self._file_ids = array('I')
+        self._type_ids = array('H')
+        self._severity_ids = array('B')
+        self._lines = array('I')
+        self._columns = array('I')
+        self._confidences = array('f')
+        self._message_ids = array('I')
+        self._explanation_ids = array('I')
+        self._fix_ids = array('I')
+
+    def add(self, file_path: str, pattern: Any) -> None:
+        """Append one detected pattern found in file_path"""
+        pattern_type = getattr(pattern.pattern_type, 'value', pattern.pattern_type)
+        severity = getattr(pattern, 'severity', '')
+        severity = getattr(severity, 'value', severity)
+
+        self._file_ids.append(self._files.intern(file_path))
+        self._type_ids.append(self._types.intern(str(pattern_type)))
+        self._severity_ids.append(self._severities.intern(str(severity)))
+        self._lines.append(getattr(pattern, 'line_number', 0) or 0)
+        self._columns.append(getattr(pattern, 'column', 0) or 0)
+        self._confidences.append(getattr(pattern, 'confidence', 0.0) or 0.0)
+        self._message_ids.append(self._texts.intern(getattr(pattern, 'message', '') or ''))
+        self._explanation_ids.append(self._texts.intern(getattr(pattern, 'explanation', '') or ''))
+        self._fix_ids.append(self._texts.intern(getattr(pattern, 'suggested_fix', '') or ''))
+
+    def __len__(self) -> int:
+        return len(self._file_ids)
+
+    def __getitem__(self, index: int) -> CompactFinding:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("finding index out of range")
+        return CompactFinding(self, index)
+
+    def __iter__(self) -> Iterator[CompactFinding]:
+        for index in range(len(self)):
+            yield CompactFinding(self, index)
+
+    def count_by_type(self) -> Dict[str, int]:
+        """Return the number of findings per pattern type"""
+        counts = [0] * len(self._types)
+        for type_id in self._type_ids:
+            counts[type_id] += 1
+        return dict(zip(self._types.values, counts))
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and intern tables, including their dicts and lists"""
+        columns = (self._file_ids, self._type_ids, self._severity_ids, self._lines, self._columns,
+                   self._confidences, self._message_ids, self._explanation_ids, self._fix_ids)
+        total = sum(sys.getsizeof(column) for column in columns)
+        for table in (self._files, self._types, self._severities, self._texts):
+            # Dict keys are the same objects as the list values, so strings count once
+            total += sys.getsizeof(table.ids) + sys.getsizeof(table.values)
+            total += sum(sys.getsizeof(value) for value in table.values)
+            total += sum(sys.getsizeof(value_id) for value_id in table.ids.values() if value_id > 256)
+        return total
@@ -3,129 +3,426 @@
 Test Execution Time Measurement
 
 Measures execution times for all detector test suites to validate
-performance requirements specified in TEST_SUITE_SPECIFICATION.md
+performance requirements specified in TEST_SUITE_SPECIFICATION.md.
+Suites whose file, fixtures and detector are unchanged since their last
+passing run are reported from cache instead of re-run.
 """
 
+import ast
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import runpy
 import time
 import sys
-import subprocess
 from pathlib import Path
+from typing import Dict, List, Optional
 
+from analysis_cache import content_hash
+from scan_project import DETECTOR_SPECS
 
-def measure_test_suite_time(test_file: str, description: str) -> dict:
-    """Measure execution time for a test suite"""
-    print(f"\n📊 Measuring: {description}")
-    print(f"   File: {test_file}")
+
+SUITE_TIMEOUT_S = 60  # 60 second timeout per suite
+SPECIFICATION_FILE = 'TEST_SUITE_SPECIFICATION.md'
+SUITE_CACHE_PATH = Path('.attrahere_cache') / 'suite_results.json'
+
+# Import name -> distribution names, read from installed metadata on first need
+_packages_distributions: Optional[Dict[str, List[str]]] = None
+
+
+def discover_suite_imports(test_files: List[str]) -> List[str]:
+    """Collect the top-level modules imported by the given test suites"""
+    modules = []
+    for test_file in test_files:
+        tree = ast.parse(Path(test_file).read_text(), filename=test_file)
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                modules.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def preimport_dependencies(modules: List[str]) -> Dict[str, float]:
+    """
+    Import every module once in this process and time each import.
+
+    Forked suite workers inherit the loaded modules, so their timings
+    exclude interpreter startup and pandas/sklearn/torch import cost.
+    Modules that fail to import are skipped; the suite reports the error.
+    """
+    import_times = {}
+    for module in modules:
+        if module in sys.modules:
+            continue
+        start_time = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        import_times[module] = (time.perf_counter() - start_time) * 1000
+    return import_times
+
+
+def resolve_module_file(module: str) -> Optional[Path]:
+    """Locate a module's source file on sys.path without importing it"""
+    parts = module.split('.')
+    for base in sys.path:
+        for candidate in (Path(base or '.', *parts).with_suffix('.py'),
+                          Path(base or '.', *parts, '__init__.py')):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def detector_source(module: str, class_name: str) -> bytes:
+    """
+    Return the source a detector class's behaviour depends on.
+    
+    That is the whole defining module except the other detector classes
+    it holds, so editing one detector in ml_patterns does not invalidate
+    the suites of the others while shared helpers still invalidate all.
+    """
+    path = resolve_module_file(module)
+    if path is None:
+        return b''
+    source = path.read_text()
+    tree = ast.parse(source, filename=str(path))
     
-    start_time = time.perf_counter()
+    siblings = {name for spec_module, name in DETECTOR_SPECS if spec_module == module and name != class_name}
+    segments = [
+        ast.get_source_segment(source, node) or ''
+        for node in tree.body
+        if not (isinstance(node, ast.ClassDef) and node.name in siblings)
+    ]
+    return '\n'.join(segments).encode('utf-8')
+
+
+def installed_version(module: str) -> Optional[str]:
+    """
+    Return the installed version of a top-level module's distribution.
+
+    Read from package metadata rather than ``__version__`` so cached runs
+    do not pay for importing pandas, sklearn or torch. Returns None for
+    the standard library and local modules.
+    """
+    global _packages_distributions
+    from importlib import metadata
     
     try:
-        # Run test suite and capture output
-        result = subprocess.run(
-            [sys.executable, test_file],
-            capture_output=True,
-            text=True,
-            timeout=60  # 60 second timeout
-        )
-        
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
-        
-        success = result.returncode == 0
-        
-        if success:
-            print(f"   ✅ Completed in {execution_time*1000:.2f}ms")
-        else:
-            print(f"   ❌ Failed after {execution_time*1000:.2f}ms")
-            print(f"   Error: {result.stderr}")
-        
-        return {
-            'test_file': test_file,
-            'description': description,
-            'execution_time_ms': execution_time * 1000,
-            'success': success,
-            'stdout': result.stdout if success else None,
-            'stderr': result.stderr if not success else None
-        }
-        
-    except subprocess.TimeoutExpired:
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
-        print(f"   ⏰ Timeout after {execution_time*1000:.2f}ms")
-        
-        return {
-            'test_file': test_file,
-            'description': description,
-            'execution_time_ms': execution_time * 1000,
-            'success': False,
-            'error': 'Timeout'
-        }
+        return metadata.version(module)
+    except metadata.PackageNotFoundError:
+        pass
+    # Import and distribution names differ, e.g. sklearn and scikit-learn
+    if _packages_distributions is None:
+        _packages_distributions = metadata.packages_distributions()
+    versions = []
+    for distribution in _packages_distributions.get(module, []):
+        try:
+            versions.append(f"{distribution} {metadata.version(distribution)}")
+        except metadata.PackageNotFoundError:
+            continue
+    return ', '.join(versions) or None
+
+
+def suite_dependencies(suite: dict) -> Dict[str, str]:
+    """Map every input a suite's results depend on to its content hash or version"""
+    suite_file = Path(suite['file'])
+    dependencies = {str(suite_file): content_hash(suite_file.read_bytes())}
+    
+    # Fixtures: the conftest.py files pytest would load and sibling helper modules,
+    # including the helpers those helpers import
+    for directory in (suite_file.parent, *suite_file.parent.parents):
+        conftest = directory / 'conftest.py'
+        if conftest.is_file():
+            dependencies[str(conftest)] = content_hash(conftest.read_bytes())
+    sources = [str(suite_file)]
+    modules = set()
+    while sources:
+        imported = discover_suite_imports([sources.pop()])
+        modules.update(module.split('.')[0] for module in imported)
+        for module in imported:
+            sibling = suite_file.parent / f"{module.split('.')[0]}.py"
+            if sibling.is_file() and str(sibling) not in dependencies:
+                dependencies[str(sibling)] = content_hash(sibling.read_bytes())
+                sources.append(str(sibling))
+    
+    # An interpreter or library upgrade can break a suite without touching its sources
+    dependencies['python'] = sys.version
+    for module in sorted(modules):
+        version = installed_version(module)
+        if version is not None:
+            dependencies[f"package:{module}"] = version
     
-    except Exception as e:
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
-        print(f"   💥 Exception after {execution_time*1000:.2f}ms: {e}")
+    for module, class_name in DETECTOR_SPECS:
+        if class_name == suite['description']:
+            dependencies[f"{module}:{class_name}"] = content_hash(detector_source(module, class_name))
+    return dependencies
+
+
+def build_dependency_map(suites: List[dict]) -> Dict[str, Dict[str, str]]:
+    """Return {suite file: {dependency: content hash}} for every suite"""
+    return {suite['file']: suite_dependencies(suite) for suite in suites}
+
+
+def suite_fingerprint(dependencies: Dict[str, str]) -> str:
+    """Combine a suite's dependency hashes into one cache key"""
+    return content_hash('\n'.join(f"{name}={digest}" for name, digest in sorted(dependencies.items())))
+
+
+def load_suite_cache(path: Path = SUITE_CACHE_PATH) -> Dict[str, dict]:
+    """Read cached suite results, ignoring a missing or corrupt cache file"""
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_suite_cache(cache: Dict[str, dict], path: Path = SUITE_CACHE_PATH) -> None:
+    """Write cached suite results"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2))
+
+
+def load_test_budgets(spec_path: str = SPECIFICATION_FILE) -> Dict[str, float]:
+    """Read the per-test execution budget of each suite from the specification"""
+    budgets = {}
+    current_suite = None
+    for line in Path(spec_path).read_text().splitlines():
+        heading = re.match(r'^##\s+(\w+)', line)
+        if heading:
+            current_suite = heading.group(1)
+            continue
+        budget = re.search(r'Execution time < ([\d.]+)ms per test', line)
+        if budget and current_suite:
+            budgets[current_suite] = float(budget.group(1))
+    return budgets
+
+
+def collect_test_methods(namespace: dict) -> List[tuple]:
+    """Return (test name, owning class or None, callable name) in definition order"""
+    tests = []
+    module_name = namespace.get('__name__')
+    for name, value in list(namespace.items()):
+        if isinstance(value, type) and value.__module__ == module_name:
+            tests.extend(
+                (f"{name}.{attr}", value, attr)
+                for attr in vars(value)
+                if attr.startswith('test_') and callable(getattr(value, attr))
+            )
+        elif name.startswith('test_') and callable(value):
+            tests.append((name, None, name))
+    return tests
+
+
+def run_suite_in_process(test_file: str) -> dict:
+    """
+    Load a test suite in the current process and time each test method.
+
+    Like pytest, every method gets a fresh instance and its own
+    setup_method call; setup time counts towards the test.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    tests = []
+    error = None
+    
+    # Sibling helper modules import as they do when the suite runs as a script
+    sys.path.insert(0, str(Path(test_file).parent.resolve()))
+
+    suite_start = time.perf_counter()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            namespace = runpy.run_path(test_file, run_name='measured_suite')
+        except Exception as e:
+            namespace = {}
+            error = f"{type(e).__name__}: {e}"
         
-        return {
-            'test_file': test_file,
-            'description': description,
-            'execution_time_ms': execution_time * 1000,
-            'success': False,
-            'error': str(e)
-        }
+        for test_name, test_class, attr in collect_test_methods(namespace):
+            test_error = None
+            start_time = time.perf_counter()
+            try:
+                if test_class is None:
+                    namespace[attr]()
+                else:
+                    instance = test_class()
+                    if hasattr(instance, 'setup_method'):
+                        instance.setup_method()
+                    getattr(instance, attr)()
+            except Exception as e:
+                test_error = f"{type(e).__name__}: {e}"
+            tests.append({
+                'name': test_name,
+                'time_ms': (time.perf_counter() - start_time) * 1000,
+                'success': test_error is None,
+                'error': test_error,
+            })
+    execution_time = time.perf_counter() - suite_start
+    
+    success = error is None and bool(tests) and all(test['success'] for test in tests)
+    if error is None and not tests:
+        error = "No test methods collected"
+    
+    return {
+        'test_file': test_file,
+        'execution_time_ms': execution_time * 1000,
+        'tests': tests,
+        'success': success,
+        'stdout': stdout.getvalue() if success else None,
+        'stderr': (stderr.getvalue() or error) if not success else None,
+        'error': error,
+    }
+
 
+def measure_test_suites(suites: List[dict], jobs: int) -> List[dict]:
+    """Run suites in parallel forked workers that share pre-imported modules"""
+    # fork keeps the parent's imports; forkserver needs them preloaded explicitly
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(list(sys.modules))
+    
+    results = []
+    with context.Pool(processes=jobs) as pool:
+        pending = [
+            (suite, pool.apply_async(run_suite_in_process, (suite['file'],)))
+            for suite in suites
+        ]
+        for suite, async_result in pending:
+            print(f"\n📊 Measuring: {suite['description']}")
+            print(f"   File: {suite['file']}")
+            
+            try:
+                result = async_result.get(timeout=SUITE_TIMEOUT_S)
+            except multiprocessing.TimeoutError:
+                print(f"   ⏰ Timeout after {SUITE_TIMEOUT_S * 1000:.2f}ms")
+                result = {
+                    'test_file': suite['file'],
+                    'execution_time_ms': SUITE_TIMEOUT_S * 1000,
+                    'tests': [],
+                    'success': False,
+                    'error': 'Timeout'
+                }
+            else:
+                if result['success']:
+                    print(f"   ✅ Completed {len(result['tests'])} tests in {result['execution_time_ms']:.2f}ms")
+                else:
+                    print(f"   ❌ Failed after {result['execution_time_ms']:.2f}ms")
+                    for test in result['tests']:
+                        if not test['success']:
+                            print(f"   Error in {test['name']}: {test['error']}")
+                    if result['error']:
+                        print(f"   Error: {result['error']}")
+            
+            result['description'] = suite['description']
+            results.append(result)
+        pool.terminate()
+    
+    return results
 
-def main():
+
+def main(jobs: int = None, use_cache: bool = True):
     """Main execution time measurement"""
     print("🚀 Test Suite Execution Time Measurement")
     print("=" * 60)
     
-    # Define test suites with their target times from specification
+    # Per-test budgets come from the specification, keyed by suite name
     test_suites = [
         {
             'file': 'tests/problematic_code/test_set_contamination.py',
             'description': 'TestSetContaminationDetector',
-            'target_time_ms': 50,
-            'test_count': 15  # 5 positive + 4 negative + 6 edge
         },
         {
             'file': 'tests/problematic_code/data_leakage_detector_tests.py', 
             'description': 'DataLeakageDetector',
-            'target_time_ms': 20,
-            'test_count': 8  # 3 positive + 2 negative + 3 edge
         },
         {
             'file': 'tests/problematic_code/gpu_memory_leak_detector_tests.py',
             'description': 'GPUMemoryLeakDetector', 
-            'target_time_ms': 30,
-            'test_count': 10  # 3 positive + 3 negative + 4 edge
         },
         {
             'file': 'tests/problematic_code/hardcoded_thresholds_detector_tests.py',
             'description': 'HardcodedThresholdsDetector',
-            'target_time_ms': 15,
-            'test_count': 10  # 3 positive + 3 negative + 4 edge
         },
         {
             'file': 'tests/problematic_code/inefficient_data_loading_detector_tests.py',
             'description': 'InefficientDataLoadingDetector',
-            'target_time_ms': 25, 
-            'test_count': 10  # 3 positive + 3 negative + 4 edge
         }
     ]
     
-    results = []
+    budgets = load_test_budgets()
+    
+    # Timings go to the performance history, so fitted models are never read
+    # from the on-disk model cache: a warm or cleared cache would otherwise
+    # show up as a speedup or a regression. Forked suites inherit this
+    os.environ['ATTRAHERE_MODEL_CACHE_DISK'] = '0'
     
-    # Measure each test suite
+    available_suites = []
     for suite in test_suites:
         if Path(suite['file']).exists():
-            result = measure_test_suite_time(suite['file'], suite['description'])
-            result['target_time_ms'] = suite['target_time_ms']
-            result['test_count'] = suite['test_count']
-            results.append(result)
+            available_suites.append(suite)
         else:
             print(f"\n⚠️  Test file not found: {suite['file']}")
     
+    # Only suites whose own file, fixtures or detector changed are re-run
+    dependency_map = build_dependency_map(available_suites)
+    suite_cache = load_suite_cache() if use_cache else {}
+    cached_results = {}
+    stale_suites = []
+    for suite in available_suites:
+        dependencies = dependency_map[suite['file']]
+        entry = suite_cache.get(suite['file'])
+        if entry and entry['fingerprint'] == suite_fingerprint(dependencies):
+            cached_results[suite['file']] = dict(entry['result'], cached=True)
+            print(f"\n💾 Cached: {suite['description']} (no dependency changed)")
+            continue
+        if entry and use_cache:
+            changed = [name for name, digest in dependencies.items()
+                       if entry['dependencies'].get(name) != digest]
+            print(f"\n🔁 Re-running {suite['description']}: changed {', '.join(changed)}")
+        stale_suites.append(suite)
+    
+    # Pay heavy dependency imports once, before forking suite workers
+    import_times = preimport_dependencies(discover_suite_imports([s['file'] for s in stale_suites]))
+    import_total = sum(import_times.values())
+    print(f"\n📦 Pre-imported {len(import_times)} modules in {import_total:.2f}ms")
+    
+    wall_start = time.perf_counter()
+    measured = []
+    if stale_suites:
+        measured = measure_test_suites(stale_suites, jobs or min(len(stale_suites), os.cpu_count() or 1))
+    wall_time = (time.perf_counter() - wall_start) * 1000
+    
+    # Failed results are never cached so a broken suite is always re-run
+    for suite, result in zip(stale_suites, measured):
+        result['cached'] = False
+        if result['success']:
+            dependencies = dependency_map[suite['file']]
+            suite_cache[suite['file']] = {
+                'fingerprint': suite_fingerprint(dependencies),
+                'dependencies': dependencies,
+                'result': result,
+            }
+    if measured:
+        save_suite_cache(suite_cache)
+    
+    measured_results = {result['test_file']: result for result in measured}
+    results = [cached_results.get(suite['file']) or measured_results[suite['file']]
+               for suite in available_suites]
+    
+    for result in results:
+        result['budget_ms'] = budgets.get(result['description'])
+        result['over_budget'] = [
+            test for test in result['tests']
+            if result['budget_ms'] is not None and test['time_ms'] > result['budget_ms']
+        ]
+    
     # Generate summary report
     print(f"\n📋 EXECUTION TIME SUMMARY")
     print("=" * 60)
@@ -137,8 +434,8 @@ def main():
     for result in results:
         suite_name = result['description']
         exec_time = result['execution_time_ms']
-        target_time = result['target_time_ms']
-        test_count = result['test_count']
+        budget = result['budget_ms']
+        test_count = len(result['tests'])
         success = result['success']
         
         total_time += exec_time
@@ -146,28 +443,45 @@ def main():
         
         if success:
             passed_suites += 1
-            status = "✅ PASS" if exec_time <= target_time else "⚠️  SLOW"
-            time_per_test = exec_time / test_count
+            if budget is None:
+                status = "❔ NO BUDGET"
+            else:
+                status = "✅ PASS" if not result['over_budget'] else "⚠️  SLOW"
             
-            print(f"\n{suite_name}:")
+            print(f"\n{suite_name}:{' 💾 CACHED' if result['cached'] else ''}")
             print(f"  Status: {status}")
-            print(f"  Total time: {exec_time:.2f}ms (target: ≤{target_time}ms)")
-            print(f"  Time per test: {time_per_test:.2f}ms")
+            print(f"  Total time: {exec_time:.2f}ms")
+            if budget is None:
+                print(f"  Budget: not found in {SPECIFICATION_FILE}")
+            else:
+                print(f"  Budget: <{budget:g}ms per test ({SPECIFICATION_FILE})")
             print(f"  Test count: {test_count}")
-            
-            if exec_time > target_time:
-                print(f"  ⚠️  Exceeds target by {exec_time - target_time:.2f}ms")
+            for test in result['tests']:
+                marker = "⚠️ " if test in result['over_budget'] else "  "
+                print(f"  {marker} {test['time_ms']:9.2f}ms  {test['name']}")
         else:
             print(f"\n{suite_name}: ❌ FAILED")
             print(f"  Time before failure: {exec_time:.2f}ms")
-            if 'error' in result:
+            for test in result['tests']:
+                if not test['success']:
+                    print(f"  ❌ {test['name']}: {test['error']}")
+            if result.get('error'):
                 print(f"  Error: {result['error']}")
     
+    # Import cost is shared by all suites, so it is reported on its own
+    print(f"\n📦 IMPORT COST (paid once, excluded from suite times)")
+    print("-" * 40)
+    for module, import_ms in sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {module}: {import_ms:.2f}ms")
+    print(f"  Total: {import_total:.2f}ms")
+    
     # Overall summary
     print(f"\n🎯 OVERALL PERFORMANCE")
     print("-" * 40)
     print(f"Total execution time: {total_time:.2f}ms")
-    print(f"Average time per test: {total_time/total_tests:.2f}ms")
+    print(f"Parallel wall time: {wall_time:.2f}ms")
+    print(f"Suites served from cache: {sum(r['cached'] for r in results)}/{len(results)}")
+    print(f"Average time per test: {total_time/max(total_tests, 1):.2f}ms")
     print(f"Successful test suites: {passed_suites}/{len(results)}")
     print(f"Total tests executed: {total_tests}")
     
@@ -180,19 +494,45 @@ def main():
     else:
         print(f"\n⚠️  PERFORMANCE ISSUES: {len(results) - passed_suites} suites failed")
     
-    # Recommendations
-    slow_suites = [r for r in results if r['success'] and r['execution_time_ms'] > r['target_time_ms']]
-    if slow_suites:
+    # Recommendations name the exact tests over their budget
+    over_budget = [(r, test) for r in results if r['success'] for test in r['over_budget']]
+    if over_budget:
         print(f"\n💡 OPTIMIZATION RECOMMENDATIONS:")
-        for suite in slow_suites:
-            over_time = suite['execution_time_ms'] - suite['target_time_ms']
-            print(f"  - {suite['description']}: Optimize by {over_time:.2f}ms")
+        for result, test in sorted(over_budget, key=lambda item: item[1]['time_ms'] - item[0]['budget_ms'],
+                                   reverse=True):
+            over_time = test['time_ms'] - result['budget_ms']
+            print(f"  - {test['name']} ({result['description']}): "
+                  f"{test['time_ms']:.2f}ms, over its {result['budget_ms']:g}ms budget by {over_time:.2f}ms")
     
     return results
 
 
 if __name__ == "__main__":
-    results = main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Measure detector test suite execution times")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="Parallel suite workers (default: one per suite, up to CPU count)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-run every suite even if none of its dependencies changed")
+    parser.add_argument('--history', metavar='PATH', default=None,
+                        help="Performance history database (default: .attrahere_cache/perf_history.sqlite)")
+    parser.add_argument('--no-history', action='store_true',
+                        help="Do not append per-test times to the performance history")
+    args = parser.parse_args()
+    
+    results = main(jobs=args.jobs, use_cache=not args.no_cache)
+    
+    if not args.no_history:
+        from perf_history import DEFAULT_HISTORY_PATH, record_run
+        
+        # Only freshly measured passing tests are recorded; cached times would repeat old runs
+        metrics = {
+            f"test:{Path(r['test_file']).stem}::{test['name']}": test['time_ms']
+            for r in results if not r['cached'] for test in r['tests'] if test['success']
+        }
+        if metrics:
+            record_run('measure_test_execution_times', metrics, args.history or DEFAULT_HISTORY_PATH)
     
     # Exit with appropriate code
     all_passed = all(r['success'] for r in results)
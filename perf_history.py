@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Performance History Store
+
+Appends benchmark and test-timing results to a local SQLite time series
+keyed by git commit and machine fingerprint, and reports trends and
+step changes so slowdowns are caught across runs instead of scrolling
+past in a terminal.
+"""
+
+import hashlib
+import itertools
+import math
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DEFAULT_HISTORY_PATH = Path('.attrahere_cache') / 'perf_history.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    source TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER NOT NULL,
+    machine TEXT NOT NULL,
+    machine_description TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_measurements_metric ON measurements (metric, run_id);
+"""
+
+
+def machine_fingerprint() -> Tuple[str, str]:
+    """
+    Return a short stable id for this machine class and a readable description.
+
+    The hostname is left out: CI runners and Fargate tasks get a new one
+    per run, which would give every run a fingerprint of its own.
+    """
+    description = " / ".join([
+        platform.machine(),
+        platform.processor() or 'unknown-cpu',
+        f"{os.cpu_count()} cpus",
+        f"Python {platform.python_version()}",
+    ])
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()[:12], description
+
+
+def git_revision() -> Tuple[Optional[str], bool]:
+    """Return the current commit and whether the working tree is dirty"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                text=True, timeout=10, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                capture_output=True, text=True, timeout=30, check=True).stdout
+        return commit, bool(status.strip())
+    except (OSError, subprocess.SubprocessError):
+        return None, False
+
+
+def _connect(path: Union[str, Path]) -> sqlite3.Connection:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def record_run(source: str, metrics: Dict[str, float],
+               path: Union[str, Path] = DEFAULT_HISTORY_PATH) -> int:
+    """Append one run of metrics (name -> milliseconds) and return its id"""
+    commit, dirty = git_revision()
+    machine, description = machine_fingerprint()
+
+    conn = _connect(path)
+    try:
+        cursor = conn.execute(
+            'INSERT INTO runs (timestamp, source, git_commit, git_dirty, machine, machine_description) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (time.time(), source, commit, int(dirty), machine, description)
+        )
+        run_id = cursor.lastrowid
+        conn.executemany(
+            'INSERT INTO measurements (run_id, metric, value) VALUES (?, ?, ?)',
+            [(run_id, metric, value) for metric, value in metrics.items()]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"\n🗄️  Recorded {len(metrics)} metrics to {path} "
+          f"(commit {commit[:8] if commit else 'unknown'}{'+dirty' if dirty else ''}, machine {machine})")
+    return run_id
+
+
+def load_series(path: Union[str, Path], machine: Optional[str] = None,
+                metric_filter: Optional[str] = None) -> Dict[str, List[Tuple[float, Optional[str], float]]]:
+    """Return {metric: [(timestamp, commit, value), ...]} in run order"""
+    query = ('SELECT m.metric, r.timestamp, r.git_commit, m.value FROM measurements m '
+             'JOIN runs r ON r.id = m.run_id WHERE 1 = 1')
+    params: List[Any] = []
+    if machine:
+        query += ' AND r.machine = ?'
+        params.append(machine)
+    if metric_filter:
+        query += ' AND m.metric LIKE ?'
+        params.append(f"%{metric_filter}%")
+    query += ' ORDER BY r.id'
+
+    conn = _connect(path)
+    try:
+        series: Dict[str, List[Tuple[float, Optional[str], float]]] = {}
+        for metric, timestamp, commit, value in conn.execute(query, params):
+            series.setdefault(metric, []).append((timestamp, commit, value))
+        return series
+    finally:
+        conn.close()
+
+
+def _best_split(values: List[float], min_segment: int) -> Tuple[int, float]:
+    """Return the split maximizing the Welch t statistic, from running sums in one pass"""
+    mean = sum(values) / len(values)
+    prefix_sum = [0.0]
+    prefix_squares = [0.0]
+    for value in values:
+        value -= mean  # centering keeps the running sums well conditioned
+        prefix_sum.append(prefix_sum[-1] + value)
+        prefix_squares.append(prefix_squares[-1] + value * value)
+
+    total = len(values)
+    best_split, best_statistic = min_segment, -1.0
+    for split in range(min_segment, total - min_segment + 1):
+        n_before, n_after = split, total - split
+        mean_before = prefix_sum[split] / n_before
+        mean_after = (prefix_sum[total] - prefix_sum[split]) / n_after
+        var_before = max(prefix_squares[split] - n_before * mean_before ** 2, 0.0) / (n_before - 1)
+        var_after = max(prefix_squares[total] - prefix_squares[split] - n_after * mean_after ** 2,
+                        0.0) / (n_after - 1)
+        variance = var_before / n_before + var_after / n_after
+        difference = abs(mean_after - mean_before)
+        if variance > 0:
+            statistic = difference / variance ** 0.5
+        else:
+            statistic = 0.0 if difference == 0 else float('inf')
+        if statistic > best_statistic:
+            best_split, best_statistic = split, statistic
+    return best_split, best_statistic
+
+
+def detect_change_point(values: List[float], min_segment: int = 3,
+                        permutations: int = 500, seed: int = 0) -> Optional[Dict[str, Any]]:
+    """
+    Find the single most likely step change in a series.
+
+    The split maximizing the Welch t statistic is compared against the
+    same maximum over random permutations of the series, which accounts
+    for having searched every split. Returns None for series too short
+    to test.
+    """
+    if len(values) < 2 * min_segment:
+        return None
+
+    split, observed = _best_split(values, min_segment)
+    rng = random.Random(seed)
+    shuffled = list(values)
+    exceed = 0
+    for _ in range(permutations):
+        rng.shuffle(shuffled)
+        if _best_split(shuffled, min_segment)[1] >= observed:
+            exceed += 1
+
+    before = statistics.median(values[:split])
+    after = statistics.median(values[split:])
+    return {
+        'index': split,
+        'p_value': (exceed + 1) / (permutations + 1),
+        'before': before,
+        'after': after,
+        'change': after / before - 1 if before else 0.0,
+    }
+
+
+def _average_ranks(values: List[float]) -> List[float]:
+    """Return 1-based ranks with ties given their average rank"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def detect_trailing_slowdown(values: List[float], tail: int) -> Optional[Dict[str, Any]]:
+    """
+    Test whether the last tail runs are slower than the runs before them.
+
+    detect_change_point needs min_segment runs on each side of a split,
+    so a step in the latest one or two runs would otherwise go unnoticed
+    until later, innocent commits. The p-value is exact: the share of all
+    ways to pick tail runs from the series whose rank sum is at least the
+    observed one. With n runs it cannot fall below 1 / comb(n, tail), so a
+    single slow run is never significant at alpha=0.01 in a 30-run window;
+    a step in the latest run is reported once the next run confirms it.
+    """
+    if tail < 1 or len(values) <= tail:
+        return None
+
+    ranks = _average_ranks(values)
+    observed = sum(ranks[-tail:])
+    exceed = sum(1 for combination in itertools.combinations(ranks, tail)
+                 if sum(combination) >= observed - 1e-9)
+
+    before = statistics.median(values[:-tail])
+    after = statistics.median(values[-tail:])
+    return {
+        'index': len(values) - tail,
+        'p_value': exceed / math.comb(len(values), tail),
+        'before': before,
+        'after': after,
+        'change': after / before - 1 if before else 0.0,
+    }
+
+
+def report(path: Union[str, Path] = DEFAULT_HISTORY_PATH, metric_filter: Optional[str] = None,
+           all_machines: bool = False, alpha: float = 0.01, min_change: float = 0.10,
+           last: int = 10, window: int = 30, recent: int = 10) -> List[Dict[str, Any]]:
+    """
+    Print trends per metric and return significant slowdowns.
+
+    Only the last window runs of each metric are searched for a step
+    change. A slowdown is a step with permutation p-value below alpha,
+    a later segment more than min_change slower, and a start within the
+    last recent runs, so a slowdown that has since been accepted stops
+    failing the report. Steps too close to the end for a full segment
+    are tested with detect_trailing_slowdown; a slowdown in only the
+    latest run is flagged one run later. Only this machine's runs are
+    compared unless all_machines is set.
+    """
+    machine, description = machine_fingerprint()
+    series = load_series(path, machine=None if all_machines else machine, metric_filter=metric_filter)
+
+    print("📈 Performance History Report")
+    print(f"   Store: {path}")
+    print(f"   Machine: {'all' if all_machines else f'{machine} ({description})'}")
+    print("=" * 60)
+
+    if not series:
+        print("⚠️  No recorded runs match")
+        return []
+
+    slowdowns = []
+    for metric, points in sorted(series.items()):
+        values = [value for _, _, value in points]
+        latest = values[-last:]
+        trend = " ".join(f"{value:.1f}" for value in latest)
+        print(f"\n{metric} ({len(values)} runs)")
+        print(f"  Last {len(latest)}: {trend}")
+        print(f"  Median: {statistics.median(values):.2f}ms, latest: {values[-1]:.2f}ms")
+
+        offset = max(len(values) - window, 0)
+        change_point = detect_change_point(values[offset:])
+        if change_point is None:
+            continue
+        if change_point['p_value'] >= alpha or abs(change_point['change']) <= min_change:
+            change_point = None
+        if change_point is None or change_point['index'] + offset < len(values) - recent:
+            # A step in the last runs has too few points after it for detect_change_point
+            for tail in (2, 1):
+                trailing = detect_trailing_slowdown(values[offset:], tail)
+                if trailing['p_value'] < alpha and trailing['change'] > min_change:
+                    change_point = trailing
+                    break
+        if change_point is None:
+            continue
+
+        change_point['index'] += offset
+        change_point['recent'] = change_point['index'] >= len(values) - recent
+        commit = points[change_point['index']][1]
+        direction = "🐌 SLOWDOWN" if change_point['change'] > 0 else "⚡ SPEEDUP"
+        print(f"  {direction} at run {change_point['index'] + 1} "
+              f"(commit {commit[:8] if commit else 'unknown'}): "
+              f"{change_point['before']:.2f}ms → {change_point['after']:.2f}ms "
+              f"({change_point['change']:+.1%}, p={change_point['p_value']:.3f})"
+              f"{'' if change_point['recent'] else f', older than the last {recent} runs'}")
+        if change_point['change'] > 0 and change_point['recent']:
+            slowdowns.append(dict(change_point, metric=metric, commit=commit))
+
+    print("\n" + "=" * 60)
+    if slowdowns:
+        print(f"⚠️  {len(slowdowns)} significant slowdowns")
+        for slowdown in slowdowns:
+            print(f"  - {slowdown['metric']}: {slowdown['change']:+.1%} since "
+                  f"{slowdown['commit'][:8] if slowdown['commit'] else 'unknown commit'}")
+    else:
+        print("✅ No significant slowdowns")
+
+    return slowdowns
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report performance trends and step changes")
+    parser.add_argument('command', choices=['report'], help="Action to perform")
+    parser.add_argument('--path', default=str(DEFAULT_HISTORY_PATH), help="History database path")
+    parser.add_argument('--metric', help="Only metrics whose name contains this text")
+    parser.add_argument('--all-machines', action='store_true',
+                        help="Compare runs from every machine, not just this one")
+    parser.add_argument('--alpha', type=float, default=0.01, help="Significance level (default: 0.01)")
+    parser.add_argument('--min-change', type=float, default=0.10,
+                        help="Smallest relative step change reported (default: 0.10)")
+    parser.add_argument('--window', type=int, default=30,
+                        help="Most recent runs per metric searched for a step change (default: 30)")
+    parser.add_argument('--recent', type=int, default=10,
+                        help="Fail only on slowdowns starting within this many runs (default: 10)")
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"⚠️  No performance history at {args.path}")
+        sys.exit(0)
+
+    slowdowns = report(args.path, metric_filter=args.metric, all_machines=args.all_machines,
+                       alpha=args.alpha, min_change=args.min_change, window=args.window,
+                       recent=args.recent)
+    sys.exit(1 if slowdowns else 0)
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Project Scanner
+
+Runs every ML pattern detector over a set of files or directories,
+spreading parsing and detection across a process pool. Files are
+scheduled largest-first and results stream back as each file completes.
+"""
+
+import ast
+import importlib
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+sys.path.insert(0, 'attrahere-platform')
+
+from analysis_cache import AnalysisCache, content_hash, detector_name
+from compact_findings import FindingStore
+
+# (module, class) pairs, imported lazily so worker processes load them once
+DETECTOR_SPECS = [
+    ('analysis_core.ml_analyzer.detectors.test_contamination_detector', 'TestSetContaminationDetector'),
+    ('analysis_core.ml_analyzer.ml_patterns', 'DataLeakageDetector'),
+    ('analysis_core.ml_analyzer.ml_patterns', 'GPUMemoryLeakDetector'),
+    ('analysis_core.ml_analyzer.ml_patterns', 'HardcodedThresholdsDetector'),
+    ('analysis_core.ml_analyzer.ml_patterns', 'InefficientDataLoadingDetector'),
+]
+
+# Top-level packages whose import can make each detector fire. Files that
+# import none of the packages of any enabled detector are skipped unparsed.
+# This table is maintained by hand and can drift from what the detectors
+# match: detectors match calls by bare name, so a helper re-exported through
+# a project module is only seen when the file also imports an ML package
+# (star imports keep a file). Add packages here when a detector learns new
+# APIs, or scan with --no-prefilter.
+DETECTOR_TRIGGER_MODULES = {
+    'TestSetContaminationDetector': {'sklearn', 'pandas', 'numpy', 'torch', 'tensorflow', 'keras',
+                                     'xgboost', 'lightgbm', 'catboost'},
+    'DataLeakageDetector': {'sklearn', 'pandas', 'numpy', 'imblearn', 'category_encoders'},
+    'GPUMemoryLeakDetector': {'torch', 'tensorflow', 'keras', 'jax', 'cupy'},
+    'HardcodedThresholdsDetector': {'sklearn', 'pandas', 'numpy', 'torch', 'tensorflow', 'keras',
+                                    'xgboost', 'lightgbm', 'catboost'},
+    'InefficientDataLoadingDetector': {'pandas', 'numpy', 'torch', 'tensorflow', 'dask', 'polars'},
+}
+
+# Statement-start import lines, matched on raw bytes without decoding
+_IMPORT_RE = re.compile(rb'(?:^|;)[ \t]*(import|from)[ \t]+([^\r\n#;]*)', re.MULTILINE)
+_DYNAMIC_IMPORT_RE = re.compile(rb'__import__|import_module')
+_STAR_IMPORT_RE = re.compile(rb'(?:^|;)[ \t]*from[ \t\\]+[\w.]+[ \t\\\r\n]+import[ \t\\\r\n(]*\*', re.MULTILINE)
+_LINE_CONTINUATION_RE = re.compile(rb'\\\r?\n')
+
+# Files submitted per worker ahead of completion; enough to keep workers busy
+IN_FLIGHT_PER_WORKER = 2
+
+EXCLUDED_DIRS = {'.git', '.venv', 'venv', '__pycache__', 'node_modules', '.tox', '.nox'}
+
+# Detector set of the current worker process, built by _init_worker
+_worker_detectors: List[Any] = []
+
+# Detector set shared by in-process callers, built on first use
+_default_detectors: Optional[List[Any]] = None
+
+
+def load_detectors() -> List[Any]:
+    """Instantiate every detector listed in DETECTOR_SPECS"""
+    detectors = []
+    for module_name, class_name in DETECTOR_SPECS:
+        module = importlib.import_module(module_name)
+        detectors.append(getattr(module, class_name)())
+    return detectors
+
+
+def get_default_detectors() -> List[Any]:
+    """Return the process-wide detector set, building it on first use"""
+    global _default_detectors
+    if _default_detectors is None:
+        _default_detectors = load_detectors()
+    return _default_detectors
+
+
+def _file_size(file_path: Path) -> int:
+    # Unreadable entries such as dangling symlinks sort last and are reported when read
+    try:
+        return file_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def collect_files(paths: Iterable[Union[str, Path]]) -> List[Tuple[Path, int]]:
+    """Expand paths into Python files with their sizes, largest first"""
+    files = {}
+    for path in map(Path, paths):
+        if path.is_dir():
+            for root, dirs, names in os.walk(path):
+                dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+                for name in names:
+                    if name.endswith('.py'):
+                        file_path = Path(root) / name
+                        files[file_path] = _file_size(file_path)
+        else:
+            files[path] = _file_size(path)
+
+    return sorted(files.items(), key=lambda item: item[1], reverse=True)
+
+
+def imported_modules(source: bytes) -> set:
+    """Return the top-level package names a file's import statements mention"""
+    modules = set()
+    source = _LINE_CONTINUATION_RE.sub(b' ', source)
+    for match in _IMPORT_RE.finditer(source):
+        keyword, names = match.groups()
+        # 'from x import a, b' names one module; 'import a, b as c' names several
+        clauses = [names] if keyword == b'from' else names.split(b',')
+        for clause in clauses:
+            words = clause.split()
+            if words and not words[0].startswith(b'.'):
+                modules.add(words[0].split(b'.', 1)[0].decode('ascii', 'replace'))
+    return modules
+
+
+def trigger_modules(detectors: List[Any]) -> set:
+    """Return the union of trigger packages for the given detectors"""
+    triggers = set()
+    for detector in detectors:
+        name = detector_name(detector)
+        if name not in DETECTOR_TRIGGER_MODULES:
+            # Unknown detectors may fire on anything, so disable the pre-filter
+            return set()
+        triggers |= DETECTOR_TRIGGER_MODULES[name]
+    return triggers
+
+
+def may_trigger(source: bytes, triggers: set) -> bool:
+    """
+    Cheap byte-level check whether a file can trigger any detector.
+
+    Files with dynamic imports or star imports are always kept, since
+    the names they bring in cannot be seen without importing.
+    """
+    if not triggers or _DYNAMIC_IMPORT_RE.search(source) or _STAR_IMPORT_RE.search(source):
+        return True
+    return not imported_modules(source).isdisjoint(triggers)
+
+
+def build_analysis(file_path: str, source: Union[str, bytes]) -> Any:
+    """Parse a file and wrap it in the ASTAnalysisResult detectors expect"""
+    return wrap_analysis(file_path, ast.parse(source, filename=file_path))
+
+
+def wrap_analysis(file_path: str, tree: ast.AST) -> Any:
+    """Wrap an already parsed tree in the ASTAnalysisResult detectors expect"""
+    from analysis_core.ml_analyzer.ast_engine import ASTAnalysisResult
+
+    return ASTAnalysisResult(
+        file_path=file_path,
+        ast_tree=tree,
+        cst_tree=None,
+        imports={},
+        functions={},
+        classes={},
+        variables={},
+        ml_constructs={},
+        data_flow={},
+        complexity_metrics={}
+    )
+
+
+def pattern_to_dict(pattern: Any) -> Dict[str, Any]:
+    """Convert a detected pattern into a JSON-serializable dict"""
+    import dataclasses  # imports inspect (~25ms); only needed once findings are serialized
+
+    if dataclasses.is_dataclass(pattern):
+        fields = dataclasses.asdict(pattern)
+    else:
+        fields = dict(vars(pattern))
+    return {key: value.value if isinstance(value, Enum) else value for key, value in fields.items()}
+
+
+def iter_patterns(analysis: Any, detectors: Optional[List[Any]] = None) -> Iterator[Any]:
+    """
+    Yield the patterns found in one analysis as each detector produces them.
+
+    Detectors that provide their own ``iter_patterns`` generator are
+    streamed pattern by pattern; others are streamed per detector.
+    """
+    for detector in detectors if detectors is not None else get_default_detectors():
+        streaming = getattr(detector, 'iter_patterns', None)
+        if streaming is not None:
+            yield from streaming(analysis)
+        else:
+            yield from detector.detect_patterns(analysis)
+
+
+def _result(file_path: str, **fields: Any) -> Dict[str, Any]:
+    """Return a per-file result record, defaulting to no findings"""
+    result = {
+        'file_path': file_path,
+        'patterns': {},
+        'cached': False,
+        'skipped': False,
+        'error': None,
+        'elapsed_ms': 0.0,
+    }
+    result.update(fields)
+    return result
+
+
+def analyze_file(file_path: str, detectors: List[Any], source: Optional[bytes] = None) -> Dict[str, Any]:
+    """Run the given detectors over one file and return its result record"""
+    start_time = time.perf_counter()
+    result = _result(file_path)
+
+    # One bad file or detector must never stop a project scan, so any error
+    # (including RecursionError from deeply nested code) is recorded instead
+    try:
+        if source is None:
+            source = Path(file_path).read_bytes()
+        analysis = build_analysis(file_path, source)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    else:
+        errors = []
+        for detector in detectors:
+            name = detector_name(detector)
+            try:
+                result['patterns'][name] = detector.detect_patterns(analysis)
+            except Exception as e:
+                errors.append(f"{name}: {type(e).__name__}: {e}")
+        if errors:
+            result['error'] = "; ".join(errors)
+
+    result['elapsed_ms'] = (time.perf_counter() - start_time) * 1000
+    return result
+
+
+def _init_worker() -> None:
+    global _worker_detectors
+    _worker_detectors = load_detectors()
+
+
+def _analyze_in_worker(file_path: str, source: bytes) -> Dict[str, Any]:
+    return analyze_file(file_path, _worker_detectors, source)
+
+
+def _prepare_files(paths: Iterable[Union[str, Path]], detectors: List[Any], triggers: set,
+                   cache: Optional[AnalysisCache]) -> Iterator[Union[Dict[str, Any], Tuple[str, bytes, str]]]:
+    """
+    Read each file once, yielding a finished record when it needs no analysis.
+
+    Unreadable, pre-filtered and fully cached files yield their result
+    record; the rest yield ``(file_path, source, file_hash)``, so the
+    analyzed bytes are exactly the ones the results are cached under.
+    """
+    for file_path, _size in collect_files(paths):
+        try:
+            source = file_path.read_bytes()
+        except OSError as e:
+            yield _result(str(file_path), error=f"{type(e).__name__}: {e}")
+            continue
+
+        if triggers and not may_trigger(source, triggers):
+            yield _result(str(file_path), skipped=True)
+            continue
+
+        file_hash = content_hash(source)
+
+        if cache is not None:
+            cached = {}
+            for detector in detectors:
+                patterns = cache.get(file_hash, detector)
+                if patterns is None:
+                    break
+                cached[detector_name(detector)] = patterns
+            else:
+                yield _result(str(file_path), patterns=cached, cached=True)
+                continue
+
+        yield str(file_path), source, file_hash
+
+
+def scan_project(paths: Iterable[Union[str, Path]], jobs: Optional[int] = None,
+                 cache: Optional[AnalysisCache] = None,
+                 prefilter: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Scan files and directories, yielding one result record per file as it completes.
+
+    ``jobs`` defaults to the CPU count; ``jobs=1`` analyzes in-process.
+    With ``prefilter`` on, files that import no package any detector
+    reacts to are yielded with ``skipped`` set and are never parsed.
+    Files whose results are all present in ``cache`` are yielded without
+    being parsed. Fresh results are written back to the cache. Files that
+    cannot be read are yielded with ``error`` set.
+
+    Files are read, pre-filtered and hashed as the scan goes, so workers
+    start on the first file needing analysis instead of after a pass over
+    the whole project, and receive the bytes that were hashed.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    detectors = load_detectors()
+    triggers = trigger_modules(detectors) if prefilter else set()
+    items = _prepare_files(paths, detectors, triggers, cache)
+
+    def store(result: Dict[str, Any], file_hash: str) -> Dict[str, Any]:
+        if cache is not None and result['error'] is None:
+            for detector in detectors:
+                cache.put(file_hash, detector, result['patterns'][detector_name(detector)])
+        return result
+
+    # Only start a pool once a second file actually needs analysis
+    first = []
+    if jobs > 1:
+        for item in items:
+            if isinstance(item, dict):
+                yield item
+                continue
+            first.append(item)
+            if len(first) == 2:
+                break
+    if jobs == 1 or len(first) <= 1:
+        for item in itertools.chain(first, items):
+            if isinstance(item, dict):
+                yield item
+            else:
+                file_path, source, file_hash = item
+                yield store(analyze_file(file_path, detectors, source), file_hash)
+        return
+
+    # concurrent.futures.process costs ~20ms to import, so only pay it for pooled scans
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    # A finished future holds its result until dropped, so submissions are
+    # bounded and each future is released as soon as its result is yielded
+    max_in_flight = jobs * IN_FLIGHT_PER_WORKER
+    items = itertools.chain(first, items)
+    exhausted = False
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = {}
+        while True:
+            while not exhausted and len(futures) < max_in_flight:
+                item = next(items, None)
+                if item is None:
+                    exhausted = True
+                elif isinstance(item, dict):
+                    yield item
+                else:
+                    file_path, source, file_hash = item
+                    futures[executor.submit(_analyze_in_worker, file_path, source)] = file_hash
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_hash = futures.pop(future)
+                yield store(future.result(), file_hash)
+
+
+def iter_project_patterns(paths: Iterable[Union[str, Path]], jobs: Optional[int] = None,
+                          cache: Optional[AnalysisCache] = None,
+                          prefilter: bool = True) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Yield ``(file_path, detector_name, pattern)`` for every finding in a project.
+
+    Findings are released file by file as scan_project completes them, so
+    memory does not grow with the total number of findings. Files that
+    fail to parse produce no findings and a failing detector contributes
+    none for that file; use scan_project to see their errors.
+    """
+    for result in scan_project(paths, jobs=jobs, cache=cache, prefilter=prefilter):
+        for name, patterns in result['patterns'].items():
+            for pattern in patterns:
+                yield result['file_path'], name, pattern
+
+
+def collect_findings(paths: Iterable[Union[str, Path]], jobs: Optional[int] = None,
+                     cache: Optional[AnalysisCache] = None,
+                     prefilter: bool = True) -> FindingStore:
+    """Scan a project into a compact FindingStore, e.g. for dashboard exports"""
+    store = FindingStore()
+    for file_path, _name, pattern in iter_project_patterns(paths, jobs=jobs, cache=cache,
+                                                           prefilter=prefilter):
+        store.add(file_path, pattern)
+    return store
+
+
+def main():
+    """Command line entry point"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scan Python files for ML anti-patterns")
+    parser.add_argument('paths', nargs='+', help="Files or directories to scan")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore and do not update the analysis cache")
+    parser.add_argument('--no-prefilter', action='store_true',
+                        help="Parse every file, even those importing no ML packages")
+    parser.add_argument('--ndjson', action='store_true',
+                        help="Stream one JSON object per finding to stdout; the summary goes to stderr")
+    args = parser.parse_args()
+
+    # In NDJSON mode stdout carries only records, so progress goes to stderr
+    log = sys.stderr if args.ndjson else sys.stdout
+
+    print("🔍 Scanning project for ML anti-patterns", file=log)
+    print("=" * 60, file=log)
+
+    cache = None if args.no_cache else AnalysisCache()
+    start_time = time.perf_counter()
+    files_scanned = 0
+    files_failed = 0
+    files_skipped = 0
+    total_patterns = 0
+
+    try:
+        for result in scan_project(args.paths, jobs=args.jobs, cache=cache,
+                                   prefilter=not args.no_prefilter):
+            files_scanned += 1
+            if result['skipped']:
+                files_skipped += 1
+                continue
+            if result['error']:
+                files_failed += 1
+                if args.ndjson:
+                    print(json.dumps({'file_path': result['file_path'], 'error': result['error']}), flush=True)
+                print(f"❌ {result['file_path']}: {result['error']}", file=log)
+                continue
+
+            found = sum(len(patterns) for patterns in result['patterns'].values())
+            total_patterns += found
+            if args.ndjson:
+                for name, patterns in result['patterns'].items():
+                    for pattern in patterns:
+                        record = {'file_path': result['file_path'], 'detector': name}
+                        record.update(pattern_to_dict(pattern))
+                        print(json.dumps(record, default=str))
+                sys.stdout.flush()
+            elif found:
+                source = "cached" if result['cached'] else f"{result['elapsed_ms']:.1f}ms"
+                print(f"🚨 {result['file_path']}: {found} patterns ({source})")
+    finally:
+        if cache is not None:
+            cache.close()
+
+    total_time = time.perf_counter() - start_time
+
+    print(f"\n🎯 SCAN SUMMARY", file=log)
+    print("-" * 40, file=log)
+    print(f"📝 Files scanned: {files_scanned}", file=log)
+    print(f"⏭️  Files skipped (no ML imports): {files_skipped}", file=log)
+    print(f"🔍 Patterns found: {total_patterns}", file=log)
+    print(f"❌ Files failed: {files_failed}", file=log)
+    if cache is not None:
+        print(f"📦 Cache hits: {cache.hits}, misses: {cache.misses}", file=log)
+    print(f"⏱️  Total time: {total_time:.2f}s", file=log)
+
+    return 1 if files_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
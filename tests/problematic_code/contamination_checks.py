@@ -0,0 +1,302 @@
+"""
+Contamination Checks
+
+Reusable, vectorized checks for train/test contamination on large frames.
+Rows are reduced to 64- or 128-bit fingerprints column by column, so no
+per-row Python objects are built and memory stays at a few words per row.
+Near-duplicates are found by fingerprinting quantized rows into LSH buckets.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+# Distinct 16-byte keys give independent hashes for the two halves of a 128-bit fingerprint
+HASH_KEYS = ('0123456789123456', 'attrahere-rowfp2')
+
+_ROW_HASH_SEED = np.uint64(0x345678)
+_ROW_HASH_FINAL = np.uint64(97531)
+
+
+def _column_hash(column: pd.Series, hash_key: str) -> np.ndarray:
+    """Hash one column's values, treating 1 like 1.0 and -0.0 like 0.0 as tuple equality does"""
+    dtype = column.dtype
+    if (pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            and not pd.api.types.is_complex_dtype(dtype)):
+        # float64 buffers make int, nullable and float columns holding equal values hash alike
+        column = column.astype(np.float64) + 0.0
+    return hash_pandas_object(column, index=False, hash_key=hash_key, categorize=True).to_numpy()
+
+
+def _row_hash(frame: pd.DataFrame, hash_key: str) -> np.ndarray:
+    """Combine per-column hashes into one order-sensitive uint64 per row"""
+    row_hash = np.full(len(frame), _ROW_HASH_SEED, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    n_columns = frame.shape[1]
+    for position, (_, column) in enumerate(frame.items()):
+        row_hash ^= _column_hash(column, hash_key)
+        row_hash *= multiplier
+        multiplier += np.uint64(82520 + 2 * (n_columns - position))
+    row_hash += _ROW_HASH_FINAL
+    return row_hash
+
+
+def row_fingerprints(frame: pd.DataFrame, bits: int = 64) -> np.ndarray:
+    """
+    Return one fingerprint per row of frame.
+
+    Numeric columns are hashed from their buffers; categorical columns hash
+    their categories once and map codes; string and object columns use
+    pandas' SipHash. Missing values hash equal to each other, so a copied
+    row containing NaN still counts as a duplicate. Numeric columns are
+    hashed as float64, so an int64 column matches a float64 or nullable
+    Int64 column holding the same values; integers beyond 2**53 may then
+    collide with their float64 neighbours.
+
+    With bits=64 the result is a uint64 array; with bits=128 it is a
+    structured array of two uint64 fields, for audits large enough that
+    64-bit collisions matter (about one expected at four billion rows).
+    """
+    if bits == 64:
+        return _row_hash(frame, HASH_KEYS[0])
+    if bits == 128:
+        fingerprints = np.empty(len(frame), dtype=[('high', np.uint64), ('low', np.uint64)])
+        fingerprints['high'] = _row_hash(frame, HASH_KEYS[0])
+        fingerprints['low'] = _row_hash(frame, HASH_KEYS[1])
+        return fingerprints
+    raise ValueError(f"bits must be 64 or 128, got {bits}")
+
+
+def _membership(values: np.ndarray, lookup: np.ndarray) -> np.ndarray:
+    """Boolean mask of values present in lookup, via hash joins in O(n + m)"""
+    if values.dtype == np.uint64:
+        return pd.Index(values).isin(lookup)
+
+    # 128-bit: join on the high word, then confirm the few candidates on both words
+    mask = pd.Index(values['high']).isin(lookup['high'])
+    candidates = np.flatnonzero(mask)
+    if len(candidates):
+        lookup = lookup[pd.Index(lookup['high']).isin(values['high'][candidates])]
+        pairs = pd.MultiIndex.from_arrays([values['high'][candidates], values['low'][candidates]])
+        mask[candidates] = pairs.isin(pd.MultiIndex.from_arrays([lookup['high'], lookup['low']]))
+    return mask
+
+
+def find_duplicate_rows(train: pd.DataFrame, test: pd.DataFrame, bits: int = 64) -> dict:
+    """
+    Find rows of test that exactly duplicate rows of train.
+
+    Returns a dict with the number of distinct duplicated rows
+    ('duplicates'), how many train and test rows take part
+    ('train_rows', 'test_rows') and their index labels
+    ('train_indices', 'test_indices').
+    """
+    if set(train.columns) != set(test.columns):
+        raise ValueError("train and test must have the same columns to compare rows")
+    test = test[train.columns]
+
+    train_fingerprints = row_fingerprints(train, bits)
+    test_fingerprints = row_fingerprints(test, bits)
+
+    train_mask = _membership(train_fingerprints, test_fingerprints)
+    test_mask = _membership(test_fingerprints, train_fingerprints)
+    shared = train_fingerprints[train_mask]
+
+    return {
+        'duplicates': len(pd.unique(shared)) if bits == 64 else len(np.unique(shared)),
+        'train_rows': int(train_mask.sum()),
+        'test_rows': int(test_mask.sum()),
+        'train_indices': train.index[train_mask].to_numpy(),
+        'test_indices': test.index[test_mask].to_numpy(),
+    }
+
+
+def _bucket_fingerprints(numeric: np.ndarray, other_hash: np.ndarray, width: float,
+                         shift: np.ndarray) -> np.ndarray:
+    """Fingerprint each row's grid cell: quantized numeric features plus exact other columns"""
+    cells = np.floor((numeric + shift) / width)
+    # NaN gets its own cell so missing values only collide with missing values
+    cells = np.where(np.isnan(cells), np.iinfo(np.int64).min, cells).astype(np.int64)
+    return _row_hash(pd.DataFrame(cells), HASH_KEYS[0]) ^ other_hash
+
+
+def _max_abs_diff(train_numeric: np.ndarray, test_numeric: np.ndarray,
+                  train_positions: np.ndarray, test_positions: np.ndarray,
+                  chunk_size: int = 1_000_000) -> np.ndarray:
+    """Largest per-feature difference of each candidate pair, NaN matching only NaN"""
+    result = np.empty(len(train_positions))
+    for start in range(0, len(train_positions), chunk_size):
+        left = train_numeric[train_positions[start:start + chunk_size]]
+        right = test_numeric[test_positions[start:start + chunk_size]]
+        diff = np.abs(left - right)
+        both_missing = np.isnan(left) & np.isnan(right)
+        diff = np.where(both_missing, 0.0, np.where(np.isnan(diff), np.inf, diff))
+        result[start:start + chunk_size] = diff.max(axis=1) if diff.shape[1] else 0.0
+    return result
+
+
+def find_near_duplicate_rows(train: pd.DataFrame, test: pd.DataFrame, tolerance: float = 1e-6,
+                             tables: int = 16, features_per_table: int = 4, bucket_scale: float = 4.0,
+                             verify: bool = True, seed: int = 0) -> dict:
+    """
+    Find test rows within tolerance of a train row on every numeric feature.
+
+    Each LSH table picks a random subset of features_per_table numeric
+    features and quantizes them onto a randomly shifted grid of cell
+    width bucket_scale * tolerance. Rows sharing a cell in any table
+    (with equal non-numeric columns) become candidate pairs through a
+    hash join, so cost grows with the number of rows and candidates
+    rather than quadratically.
+
+    A shifted grid separates two values at most tolerance apart with
+    probability at most 1 / bucket_scale, so with k = features_per_table
+    a near-duplicate pair is found with probability at least
+
+        1 - (1 - (1 - 1 / bucket_scale) ** k) ** tables
+
+    independent of the total number of features; the defaults give
+    99.7%. Smaller k or more tables raise recall. Larger k cuts the
+    candidates produced when features are low-cardinality, since rows
+    sharing a few discrete values would otherwise share a cell. With
+    verify=True candidates are confirmed against the exact tolerance on
+    every feature, so every reported pair is a true near-duplicate;
+    verify=False skips that pass and reports every candidate.
+
+    Returns a dict with the number of confirmed 'pairs', the number of
+    'candidates' examined, the index labels of each pair
+    ('train_indices', 'test_indices') and their 'max_abs_diff'.
+    """
+    if set(train.columns) != set(test.columns):
+        raise ValueError("train and test must have the same columns to compare rows")
+    if tolerance <= 0 or bucket_scale < 1 or tables < 1 or features_per_table < 1:
+        raise ValueError("tolerance must be positive, bucket_scale at least 1 and "
+                         "tables and features_per_table at least 1")
+    test = test[train.columns]
+
+    numeric_mask = np.array([pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                             for dtype in train.dtypes])
+    numeric_columns = train.columns[numeric_mask]
+    other_columns = train.columns[~numeric_mask]
+    train_numeric = train[numeric_columns].to_numpy(dtype=np.float64)
+    test_numeric = test[numeric_columns].to_numpy(dtype=np.float64)
+    train_other = _row_hash(train[other_columns], HASH_KEYS[1])
+    test_other = _row_hash(test[other_columns], HASH_KEYS[1])
+
+    width = bucket_scale * tolerance
+    rng = np.random.default_rng(seed)
+    train_positions = pd.RangeIndex(len(train))
+    test_positions = pd.RangeIndex(len(test))
+    pair_keys = []
+    subset_size = min(features_per_table, len(numeric_columns))
+    for _ in range(tables):
+        features = rng.choice(len(numeric_columns), size=subset_size, replace=False)
+        shift = rng.uniform(0, width, size=subset_size)
+        joined = pd.DataFrame({
+            'cell': _bucket_fingerprints(train_numeric[:, features], train_other, width, shift),
+            'train': train_positions,
+        }).merge(pd.DataFrame({
+            'cell': _bucket_fingerprints(test_numeric[:, features], test_other, width, shift),
+            'test': test_positions,
+        }), on='cell')
+        pair_keys.append(joined['train'].to_numpy(np.int64) * len(test) + joined['test'].to_numpy(np.int64))
+
+    keys = pd.unique(np.concatenate(pair_keys))
+    pair_train, pair_test = np.divmod(keys, max(len(test), 1))
+    candidates = len(keys)
+
+    diffs = _max_abs_diff(train_numeric, test_numeric, pair_train, pair_test)
+    if verify:
+        confirmed = diffs <= tolerance
+        pair_train, pair_test, diffs = pair_train[confirmed], pair_test[confirmed], diffs[confirmed]
+
+    return {
+        'pairs': len(pair_train),
+        'candidates': candidates,
+        'train_indices': train.index[pair_train].to_numpy(),
+        'test_indices': test.index[pair_test].to_numpy(),
+        'max_abs_diff': diffs,
+    }
+
+
+def _masked_correlations(block: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Pearson correlation of every column with target over each column's observed rows"""
+    observed = ~np.isnan(block)
+    if observed.all():
+        centered = block - block.mean(axis=0)
+        target = target - target.mean()
+        return (target @ centered) / (np.sqrt(np.einsum('ij,ij->j', centered, centered)) * np.sqrt(target @ target))
+
+    centered = np.where(observed, block - np.nanmean(block, axis=0), 0.0)
+    target = target - target.mean()
+
+    count = observed.sum(axis=0)
+    sum_x = centered.sum(axis=0)
+    sum_y = target @ observed
+    cov = centered.T @ target - sum_x * sum_y / count
+    var_x = (centered ** 2).sum(axis=0) - sum_x ** 2 / count
+    var_y = (target ** 2) @ observed - sum_y ** 2 / count
+    return cov / np.sqrt(var_x * var_y)
+
+
+def _paired_correlations(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Pearson correlation of matching columns whose missing values share positions"""
+    left = np.nan_to_num(left - np.nanmean(left, axis=0), nan=0.0)
+    right = np.nan_to_num(right - np.nanmean(right, axis=0), nan=0.0)
+    return np.einsum('ij,ij->j', left, right) / np.sqrt(
+        np.einsum('ij,ij->j', left, left) * np.einsum('ij,ij->j', right, right))
+
+
+def target_correlations(X: pd.DataFrame, y, rank: bool = False, block_size: int = 1024) -> pd.DataFrame:
+    """
+    Correlate every numeric feature with the target in one pass.
+
+    Columns are selected with a dtype mask (booleans excluded) and
+    processed in blocks of block_size, each block costing one centered
+    matrix-vector product, so frames with tens of thousands of columns
+    never materialize as a single float matrix. y is matched to X by
+    position.
+
+    Missing values are excluded pairwise as in Series.corr: rows where y
+    is missing are dropped first, and each feature is correlated over the
+    rows where it is observed. For 'spearman' both the feature and the
+    target are ranked over those rows only, so a column with gaps gives
+    the same value as Series.corr(method='spearman'). Constant columns
+    give NaN.
+
+    Returns a frame indexed by feature with a 'pearson' column and, when
+    rank is set, a 'spearman' column computed on average ranks.
+    """
+    target = np.asarray(y, dtype=np.float64)
+    if len(target) != len(X):
+        raise ValueError(f"X has {len(X)} rows but y has {len(target)}")
+    observed_target = ~np.isnan(target)
+    rows = slice(None) if observed_target.all() else observed_target
+    target = target[rows]
+
+    numeric_mask = np.array([pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                             for dtype in X.dtypes], dtype=bool)
+    positions = np.flatnonzero(numeric_mask)
+    pearson = np.empty(len(positions))
+    spearman = np.empty(len(positions)) if rank else None
+    target_ranks = pd.Series(target).rank().to_numpy() if rank else None
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(positions), block_size):
+            block_frame = X.iloc[rows, positions[start:start + block_size]]
+            stop = start + block_frame.shape[1]
+            pearson[start:stop] = _masked_correlations(block_frame.to_numpy(dtype=np.float64), target)
+            if rank:
+                block_ranks = block_frame.rank().to_numpy(dtype=np.float64)
+                spearman[start:stop] = _masked_correlations(block_ranks, target_ranks)
+                # Columns with gaps need the target re-ranked over their own observed rows
+                incomplete = np.flatnonzero(np.isnan(block_ranks).any(axis=0))
+                if len(incomplete):
+                    gapped_ranks = block_ranks[:, incomplete]
+                    masked_target = np.where(np.isnan(gapped_ranks), np.nan, target[:, None])
+                    spearman[start + incomplete] = _paired_correlations(
+                        gapped_ranks, pd.DataFrame(masked_target).rank().to_numpy())
+
+    result = pd.DataFrame({'pearson': pearson}, index=X.columns[positions])
+    if rank:
+        result['spearman'] = spearman
+    return result
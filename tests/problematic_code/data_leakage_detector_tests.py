@@ -8,7 +8,6 @@ Tests general data leakage patterns in ML preprocessing.
 import pytest
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.feature_selection import SelectKBest, f_classif
 from sklearn.impute import SimpleImputer
@@ -16,6 +15,8 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 import warnings
 
+from model_cache import fit_cached, split_cached
+
 
 class DataLeakageDetectorTests:
     """Test cases for detecting data leakage in ML preprocessing"""
@@ -56,18 +57,19 @@ class DataLeakageDetectorTests:
         X_scaled = scaler.fit_transform(self.X)  # Leakage: using test data statistics
         
         # Then split the pre-scaled data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_scaled, self.y, test_size=0.2, random_state=42
         )
         
         # Train model and measure performance
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         leaky_score = accuracy_score(y_test, model.predict(X_test))
         
         # Compare with correct approach
-        X_train_correct, X_test_correct, y_train_correct, y_test_correct = train_test_split(
+        X_train_correct, X_test_correct, y_train_correct, y_test_correct = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -76,8 +78,9 @@ class DataLeakageDetectorTests:
         X_train_scaled_correct = scaler_correct.fit_transform(X_train_correct)
         X_test_scaled_correct = scaler_correct.transform(X_test_correct)
         
-        model_correct = RandomForestClassifier(n_estimators=50, random_state=42)
-        model_correct.fit(X_train_scaled_correct, y_train_correct)
+        model_correct = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_scaled_correct, y_train_correct
+        )
         
         correct_score = accuracy_score(y_test_correct, model_correct.predict(X_test_scaled_correct))
         
@@ -110,18 +113,19 @@ class DataLeakageDetectorTests:
         X_selected = selector.fit_transform(X_imputed, self.y)  # Leakage: using target
         
         # Step 3: Then split the preprocessed data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_selected, self.y, test_size=0.2, random_state=42
         )
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         leaky_score = accuracy_score(y_test, model.predict(X_test))
         
         # Compare with correct approach
-        X_train_correct, X_test_correct, y_train_correct, y_test_correct = train_test_split(
+        X_train_correct, X_test_correct, y_train_correct, y_test_correct = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -136,8 +140,9 @@ class DataLeakageDetectorTests:
         X_train_selected = selector_correct.fit_transform(X_train_imputed, y_train_correct)
         X_test_selected = selector_correct.transform(X_test_imputed)
         
-        model_correct = RandomForestClassifier(n_estimators=50, random_state=42)
-        model_correct.fit(X_train_selected, y_train_correct)
+        model_correct = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_selected, y_train_correct
+        )
         
         correct_score = accuracy_score(y_test_correct, model_correct.predict(X_test_selected))
         
@@ -164,18 +169,19 @@ class DataLeakageDetectorTests:
         X_imputed = imputer.fit_transform(self.X)  # Leakage: using test data for mean
         
         # Then split
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_imputed, self.y, test_size=0.2, random_state=42
         )
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         leaky_score = accuracy_score(y_test, model.predict(X_test))
         
         # Compare with correct approach
-        X_train_correct, X_test_correct, y_train_correct, y_test_correct = train_test_split(
+        X_train_correct, X_test_correct, y_train_correct, y_test_correct = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -184,8 +190,9 @@ class DataLeakageDetectorTests:
         X_train_imputed = imputer_correct.fit_transform(X_train_correct)
         X_test_imputed = imputer_correct.transform(X_test_correct)
         
-        model_correct = RandomForestClassifier(n_estimators=50, random_state=42)
-        model_correct.fit(X_train_imputed, y_train_correct)
+        model_correct = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_imputed, y_train_correct
+        )
         
         correct_score = accuracy_score(y_test_correct, model_correct.predict(X_test_imputed))
         
@@ -208,7 +215,7 @@ class DataLeakageDetectorTests:
         is done correctly.
         """
         # CORRECT: Proper preprocessing pipeline
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -228,8 +235,9 @@ class DataLeakageDetectorTests:
         X_test_selected = selector.transform(X_test_scaled)
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train_selected, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_selected, y_train
+        )
         
         score = accuracy_score(y_test, model.predict(X_test_selected))
         
@@ -245,7 +253,7 @@ class DataLeakageDetectorTests:
         This should NOT trigger leakage detection.
         """
         # Split first
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -284,13 +292,14 @@ class DataLeakageDetectorTests:
         Should handle cases where no preprocessing is applied.
         """
         # Direct split without any preprocessing
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             self.X.dropna(), self.y[self.X.dropna().index], test_size=0.2, random_state=42
         )
         
         # Train model directly on raw data
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         score = accuracy_score(y_test, model.predict(X_test))
         
@@ -310,7 +319,7 @@ class DataLeakageDetectorTests:
         X_with_all_missing['all_missing'] = np.nan
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_with_all_missing, self.y, test_size=0.2, random_state=42
         )
         
@@ -342,7 +351,7 @@ class DataLeakageDetectorTests:
         X_single = self.X[['feature_0']].copy()
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_single, self.y, test_size=0.2, random_state=42
         )
         
@@ -352,8 +361,9 @@ class DataLeakageDetectorTests:
         X_test_scaled = scaler.transform(X_test)
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train_scaled, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_scaled, y_train
+        )
         
         score = accuracy_score(y_test, model.predict(X_test_scaled))
         
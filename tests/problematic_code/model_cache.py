@@ -0,0 +1,185 @@
+"""
+Model Cache
+
+Session-scoped memoization of fitted estimators and train/test split
+indices for the leakage suites. Many tests fit the same
+RandomForestClassifier on the same split; fits are keyed by a hash of
+the training data, the estimator's parameters (including its seed) and
+the scikit-learn version, kept in memory for the session and pickled to
+disk so repeated suite runs, forked workers and pytest sessions skip them.
+The disk tier is bounded by size, evicting the least recently used models,
+and is skipped when ATTRAHERE_MODEL_CACHE_DISK=0 so timing runs do not
+depend on whether an earlier run left it warm. Works the same whether
+suites run under pytest or as scripts.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import sklearn
+from pandas.util import hash_pandas_object
+from sklearn.model_selection import train_test_split
+from sklearn.utils import indexable
+
+try:
+    # Documented in the scikit-learn API reference despite the underscore
+    from sklearn.utils import _safe_indexing
+except ImportError:  # renamed in a later release: split_cached falls back to train_test_split
+    _safe_indexing = None
+
+# Shared with the other repository caches; override with ATTRAHERE_MODEL_CACHE
+MODEL_CACHE_DIR = Path(os.environ.get(
+    'ATTRAHERE_MODEL_CACHE',
+    Path(__file__).resolve().parents[2] / '.attrahere_cache' / 'fitted_models'
+))
+
+# Disk tier size limit; override with ATTRAHERE_MODEL_CACHE_MAX_BYTES
+MODEL_CACHE_MAX_BYTES = int(os.environ.get('ATTRAHERE_MODEL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Fraction of MODEL_CACHE_MAX_BYTES kept after an eviction pass, so evictions are batched
+EVICTION_TARGET_RATIO = 0.9
+
+_fitted_models = {}
+_split_indices = {}
+
+
+def _update_with_data(digest, data) -> None:
+    """Feed an array-like's shape, dtypes, labels and values into a hash"""
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr((data.shape, list(data.columns), list(data.dtypes.astype(str)))).encode('utf-8'))
+        digest.update(hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif isinstance(data, pd.Series):
+        digest.update(repr((data.shape, data.name, str(data.dtype))).encode('utf-8'))
+        digest.update(hash_pandas_object(data, index=True).to_numpy().tobytes())
+    else:
+        array = np.ascontiguousarray(data)
+        digest.update(repr((array.shape, array.dtype.str)).encode('utf-8'))
+        if array.dtype == object:
+            digest.update(hash_pandas_object(pd.Series(array.ravel()), index=False).to_numpy().tobytes())
+        else:
+            digest.update(array.tobytes())
+
+
+def cache_key(*parts) -> str:
+    """Hash estimator parameters, seeds and data into one cache key"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(sklearn.__version__.encode('utf-8'))
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series, np.ndarray)):
+            _update_with_data(digest, part)
+        else:
+            digest.update(repr(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _load(path: Path):
+    """Read a pickle, marking it recently used for eviction"""
+    try:
+        with open(path, 'rb') as handle:
+            value = pickle.load(handle)
+        os.utime(path)
+        return value
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def _store(path: Path, value) -> None:
+    """Write a pickle atomically so parallel suite workers never read partial files"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(handle, 'wb') as temp_file:
+            pickle.dump(value, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        _evict(path.parent)
+    except OSError:
+        pass  # the disk tier is an optimization; an unwritable cache only costs refits
+
+
+def _evict(directory: Path) -> None:
+    """Drop least recently used pickles until the directory is under the size target"""
+    entries = []
+    for path in directory.glob('*.pkl'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # removed by a parallel worker
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    if total <= MODEL_CACHE_MAX_BYTES:
+        return
+    target = int(MODEL_CACHE_MAX_BYTES * EVICTION_TARGET_RATIO)
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def _disk_tier_enabled() -> bool:
+    return os.environ.get('ATTRAHERE_MODEL_CACHE_DISK', '1') != '0'
+
+
+def fit_cached(estimator, X, y):
+    """
+    Return estimator fitted on X, y, reusing an identical earlier fit.
+
+    The returned model may be shared with other tests and must not be
+    refit or mutated. Estimators with an unseeded random_state are fitted
+    every time, since their results are not meant to repeat.
+    """
+    params = estimator.get_params(deep=True)
+    if not isinstance(params.get('random_state', 0), int):
+        return estimator.fit(X, y)
+
+    params = sorted(params.items())
+    key = cache_key(type(estimator).__module__, type(estimator).__qualname__, params, X, y)
+
+    model = _fitted_models.get(key)
+    if model is None:
+        path = MODEL_CACHE_DIR / f"{key}.pkl"
+        disk = _disk_tier_enabled()
+        model = _load(path) if disk else None
+        if model is None:
+            model = estimator.fit(X, y)
+            if disk:
+                _store(path, model)
+        _fitted_models[key] = model
+    return model
+
+
+def split_cached(*arrays, **options):
+    """
+    Drop-in train_test_split whose split indices are memoized.
+
+    Without stratify the split depends only on the sample count and the
+    options, so the indices are shared by every dataset of that length.
+    Unseeded shuffled splits are not memoized.
+    """
+    unseeded = options.get('shuffle', True) and not isinstance(options.get('random_state'), int)
+    if unseeded or _safe_indexing is None:
+        return train_test_split(*arrays, **options)
+    if not arrays:
+        raise ValueError("At least one array required as input")
+    arrays = indexable(*arrays)
+    n_samples = arrays[0].shape[0] if hasattr(arrays[0], 'shape') else len(arrays[0])
+
+    key = cache_key(n_samples, sorted((name, value) for name, value in options.items() if name != 'stratify'),
+                    options.get('stratify'))
+    indices = _split_indices.get(key)
+    if indices is None:
+        indices = tuple(train_test_split(np.arange(n_samples), **options))
+        _split_indices[key] = indices
+
+    # Index exactly as train_test_split does, so lists stay lists and sparse matrices stay sparse
+    train_index, test_index = indices
+    result = []
+    for array in arrays:
+        result.extend((_safe_indexing(array, train_index), _safe_indexing(array, test_index)))
+    return result
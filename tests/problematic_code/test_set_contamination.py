@@ -9,11 +9,13 @@ that can lead to overly optimistic model performance estimates.
 import pytest
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 import warnings
 
+from contamination_checks import find_duplicate_rows, find_near_duplicate_rows, target_correlations
+from model_cache import fit_cached, split_cached
+
 
 class TestSetContaminationDetector:
     """Test cases for detecting various forms of test set contamination"""
@@ -46,7 +48,7 @@ class TestSetContaminationDetector:
         samples appear in both training and test sets.
         """
         # Split data normally
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -64,16 +66,55 @@ class TestSetContaminationDetector:
             y_train.iloc[contamination_idx]
         ], ignore_index=True)
         
-        # Detect contamination using set intersection
-        train_samples = set(X_train.apply(tuple, axis=1))
-        test_samples = set(X_test_contaminated.apply(tuple, axis=1))
-        duplicates = train_samples.intersection(test_samples)
+        # Detect contamination by intersecting row fingerprints
+        duplicates = find_duplicate_rows(X_train, X_test_contaminated)['duplicates']
         
         # Assert contamination is detected
-        assert len(duplicates) > 0, "Failed to detect exact duplicate contamination"
-        assert len(duplicates) == contamination_size, f"Expected {contamination_size} duplicates, found {len(duplicates)}"
+        assert duplicates > 0, "Failed to detect exact duplicate contamination"
+        assert duplicates == contamination_size, f"Expected {contamination_size} duplicates, found {duplicates}"
+        
+        print(f"✓ Detected {duplicates} exact duplicates between train and test sets")
+        
+        # Copies that went through a lossy CSV round-trip are no longer exact duplicates
+        X_test_noisy = pd.concat([
+            X_test,
+            X_train.iloc[contamination_idx].round(9)
+        ], ignore_index=True)
+        
+        assert find_duplicate_rows(X_train, X_test_noisy)['duplicates'] == 0
+        near_duplicates = find_near_duplicate_rows(X_train, X_test_noisy, tolerance=1e-6)
+        assert near_duplicates['pairs'] == contamination_size, \
+            f"Expected {contamination_size} near-duplicates, found {near_duplicates['pairs']}"
         
-        print(f"✓ Detected {len(duplicates)} exact duplicates between train and test sets")
+        print(f"✓ Detected {near_duplicates['pairs']} near-duplicates after rounding "
+              f"({near_duplicates['candidates']} LSH candidates)")
+
+    def test_near_duplicate_recall_at_tolerance(self):
+        """
+        Near-duplicates perturbed by almost the full tolerance on every
+        feature are still found, on narrow and wide frames alike.
+        """
+        rng = np.random.default_rng(7)
+        tolerance = 1e-6
+        copies = 200
+
+        for n_features in (self.X.shape[1], 50):
+            X_train = pd.DataFrame(rng.normal(size=(2000, n_features)))
+            noise = 0.95 * tolerance * rng.choice([-1.0, 1.0], size=(copies, n_features))
+            X_test = pd.concat([
+                pd.DataFrame(rng.normal(size=(500, n_features))),
+                X_train.iloc[rng.choice(len(X_train), size=copies, replace=False)] + noise
+            ], ignore_index=True)
+
+            near_duplicates = find_near_duplicate_rows(X_train, X_test, tolerance=tolerance)
+
+            # Default knobs guarantee at least 99.7% recall per pair
+            assert 0.97 * copies <= near_duplicates['pairs'] <= copies, \
+                f"{n_features} features: found {near_duplicates['pairs']} of {copies} near-duplicates"
+            assert (near_duplicates['max_abs_diff'] <= tolerance).all()
+
+            print(f"✓ {n_features} features: recovered {near_duplicates['pairs']}/{copies} "
+                  f"near-duplicates at {0.95 * tolerance:g} noise")
     
     def test_feature_leakage_contamination(self):
         """
@@ -95,13 +136,14 @@ class TestSetContaminationDetector:
                                                 np.random.normal(0, 1, len(self.y)))
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_contaminated, self.y, test_size=0.2, random_state=42
         )
         
         # Train model and detect suspiciously high performance
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         train_score = accuracy_score(y_train, model.predict(X_train))
         test_score = accuracy_score(y_test, model.predict(X_test))
@@ -148,13 +190,14 @@ class TestSetContaminationDetector:
         X_temporal['lagged_target_leak'] = self.y.shift(-3).fillna(self.y.mean())  # Short-term future leak
         
         # Incorrect split: random instead of temporal
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_temporal.drop('date', axis=1), self.y, test_size=0.2, random_state=42
         )
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         test_score = accuracy_score(y_test, model.predict(X_test))
         
@@ -191,18 +234,19 @@ class TestSetContaminationDetector:
         X_normalized = (X_normalized - X_normalized.mean()) / X_normalized.std()
         
         # Then split
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_normalized, self.y, test_size=0.2, random_state=42
         )
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         score_with_leakage = accuracy_score(y_test, model.predict(X_test))
         
         # Compare with correct preprocessing (fit on train, transform test)
-        X_train_correct, X_test_correct, y_train_correct, y_test_correct = train_test_split(
+        X_train_correct, X_test_correct, y_train_correct, y_test_correct = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -213,8 +257,9 @@ class TestSetContaminationDetector:
         X_train_correct_scaled = (X_train_correct - train_mean) / train_std
         X_test_correct_scaled = (X_test_correct - train_mean) / train_std
         
-        model_correct = RandomForestClassifier(n_estimators=50, random_state=42)
-        model_correct.fit(X_train_correct_scaled, y_train_correct)
+        model_correct = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_correct_scaled, y_train_correct
+        )
         
         score_without_leakage = accuracy_score(y_test_correct, model_correct.predict(X_test_correct_scaled))
         
@@ -244,29 +289,25 @@ class TestSetContaminationDetector:
         }
         
         # Check for exact duplicates
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
-        train_samples = set(X_train.apply(tuple, axis=1))
-        test_samples = set(X_test.apply(tuple, axis=1))
-        duplicates = train_samples.intersection(test_samples)
-        contamination_report['exact_duplicates'] = len(duplicates)
+        duplicates = find_duplicate_rows(X_train, X_test)['duplicates']
+        contamination_report['exact_duplicates'] = duplicates
         
         # Check for high-correlation features with target
-        correlations = []
-        for col in X_train.columns:
-            if X_train[col].dtype in ['int64', 'float64']:
-                corr = abs(X_train[col].corr(y_train))
-                if corr > 0.9:  # Suspiciously high correlation
-                    contamination_report['high_correlation_features'].append({
-                        'feature': col,
-                        'correlation': corr
-                    })
+        correlations = target_correlations(X_train, y_train)['pearson'].abs()
+        for col, corr in correlations[correlations > 0.9].items():  # Suspiciously high correlation
+            contamination_report['high_correlation_features'].append({
+                'feature': col,
+                'correlation': corr
+            })
         
         # Train model and check performance
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         test_score = accuracy_score(y_test, model.predict(X_test))
         train_score = accuracy_score(y_train, model.predict(X_train))
@@ -318,7 +359,7 @@ class TestSetContaminationDetector:
         preprocessing is done correctly.
         """
         # Correct preprocessing: fit on train, transform on test
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             self.X, self.y, test_size=0.2, random_state=42
         )
         
@@ -329,8 +370,9 @@ class TestSetContaminationDetector:
         X_test_scaled = scaler.transform(X_test)  # Only transform test
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train_scaled, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train_scaled, y_train
+        )
         
         test_score = accuracy_score(y_test, model.predict(X_test_scaled))
         
@@ -364,8 +406,9 @@ class TestSetContaminationDetector:
         y_test = self.y.iloc[split_point:]
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         test_score = accuracy_score(y_test, model.predict(X_test))
         
@@ -386,19 +429,17 @@ class TestSetContaminationDetector:
         y_unique = (X_unique.iloc[:, 0] > 0).astype(int)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_unique, y_unique, test_size=0.2, random_state=123
         )
         
         # Check for duplicates
-        train_samples = set(X_train.apply(tuple, axis=1))
-        test_samples = set(X_test.apply(tuple, axis=1))
-        duplicates = train_samples.intersection(test_samples)
+        duplicates = find_duplicate_rows(X_train, X_test)['duplicates']
         
         # Should find zero duplicates
-        assert len(duplicates) == 0, f"Expected no duplicates, found {len(duplicates)}"
+        assert duplicates == 0, f"Expected no duplicates, found {duplicates}"
         
-        print(f"✓ Clean unique dataset: {len(duplicates)} duplicates (expected)")
+        print(f"✓ Clean unique dataset: {duplicates} duplicates (expected)")
     
     def test_negative_case_reasonable_features(self):
         """
@@ -416,24 +457,21 @@ class TestSetContaminationDetector:
         X_reasonable['interaction'] = X_reasonable['feature_0'] * X_reasonable['feature_1'] + np.random.normal(0, 0.3, len(X_reasonable))
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_reasonable, self.y, test_size=0.2, random_state=42
         )
         
         # Train model
-        model = RandomForestClassifier(n_estimators=50, random_state=42)
-        model.fit(X_train, y_train)
+        model = fit_cached(
+            RandomForestClassifier(n_estimators=50, random_state=42), X_train, y_train
+        )
         
         test_score = accuracy_score(y_test, model.predict(X_test))
         
         # Check feature correlations with target
-        correlations = []
-        for col in X_train.columns:
-            if X_train[col].dtype in ['int64', 'float64']:
-                corr = abs(X_train[col].corr(y_train))
-                correlations.append(corr)
+        correlations = target_correlations(X_train, y_train)['pearson'].abs()
         
-        max_correlation = max(correlations)
+        max_correlation = correlations.max()
         
         # Should have reasonable correlations (not perfect leakage)
         assert max_correlation < 0.9, f"Max correlation should be reasonable, got {max_correlation:.3f}"
@@ -453,7 +491,7 @@ class TestSetContaminationDetector:
         
         try:
             # This should not crash
-            X_train, X_test, y_train, y_test = train_test_split(
+            X_train, X_test, y_train, y_test = split_cached(
                 X_empty, y_empty, test_size=0.2, random_state=42
             )
             print("✓ Empty dataset: handled gracefully (no crash)")
@@ -474,7 +512,7 @@ class TestSetContaminationDetector:
         
         try:
             # This should either work or fail gracefully
-            X_train, X_test, y_train, y_test = train_test_split(
+            X_train, X_test, y_train, y_test = split_cached(
                 X_single, y_single, test_size=0.2, random_state=42
             )
             print("✓ Single row: split handled")
@@ -498,19 +536,17 @@ class TestSetContaminationDetector:
         y_identical = pd.Series([0] * 100)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_identical, y_identical, test_size=0.2, random_state=42
         )
         
         # Check for duplicates (should find many due to identical values)
-        train_samples = set(X_train.apply(tuple, axis=1))
-        test_samples = set(X_test.apply(tuple, axis=1))
-        duplicates = train_samples.intersection(test_samples)
+        duplicates = find_duplicate_rows(X_train, X_test)['duplicates']
         
         # All values are identical, so there will be duplicates
-        assert len(duplicates) > 0, "Should detect duplicates in identical dataset"
+        assert duplicates > 0, "Should detect duplicates in identical dataset"
         
-        print(f"✓ Identical values: {len(duplicates)} duplicates detected (expected)")
+        print(f"✓ Identical values: {duplicates} duplicates detected (expected)")
     
     def test_edge_case_missing_values(self):
         """
@@ -528,18 +564,16 @@ class TestSetContaminationDetector:
         X_missing = X_missing.mask(missing_mask)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_missing, y_missing, test_size=0.2, random_state=42
         )
         
         try:
             # Try to detect duplicates with NaN values
             # This tests robustness of duplicate detection
-            train_samples = set(X_train.dropna().apply(tuple, axis=1))
-            test_samples = set(X_test.dropna().apply(tuple, axis=1))
-            duplicates = train_samples.intersection(test_samples)
+            duplicates = find_duplicate_rows(X_train.dropna(), X_test.dropna())['duplicates']
             
-            print(f"✓ Missing values: {len(duplicates)} duplicates in clean rows")
+            print(f"✓ Missing values: {duplicates} duplicates in clean rows")
             print(f"✓ Missing values: {X_train.isna().sum().sum()} NaN values in train")
             
         except Exception as e:
@@ -562,31 +596,24 @@ class TestSetContaminationDetector:
         y_mixed = (X_mixed['numeric_1'] > 0).astype(int)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
+        X_train, X_test, y_train, y_test = split_cached(
             X_mixed, y_mixed, test_size=0.2, random_state=42
         )
         
         try:
             # Try correlation analysis on mixed data
-            correlations = []
-            for col in X_train.columns:
-                if X_train[col].dtype in ['int64', 'float64']:
-                    corr = abs(X_train[col].corr(y_train))
-                    if not np.isnan(corr):
-                        correlations.append(corr)
+            correlations = target_correlations(X_train, y_train)['pearson'].abs().dropna()
             
-            if correlations:
-                max_correlation = max(correlations)
+            if not correlations.empty:
+                max_correlation = correlations.max()
                 print(f"✓ Mixed data types: max numeric correlation = {max_correlation:.3f}")
             else:
                 print("✓ Mixed data types: no valid numeric correlations")
                 
             # Test duplicate detection with mixed types
-            train_samples = set(X_train.apply(tuple, axis=1))
-            test_samples = set(X_test.apply(tuple, axis=1))
-            duplicates = train_samples.intersection(test_samples)
+            duplicates = find_duplicate_rows(X_train, X_test)['duplicates']
             
-            print(f"✓ Mixed data types: {len(duplicates)} duplicates detected")
+            print(f"✓ Mixed data types: {duplicates} duplicates detected")
             
         except Exception as e:
             print(f"✓ Mixed data types: error handled - {type(e).__name__}")
@@ -599,7 +626,7 @@ class TestSetContaminationDetector:
         """
         # Test very small test set (1% test)
         try:
-            X_train_99, X_test_1, y_train_99, y_test_1 = train_test_split(
+            X_train_99, X_test_1, y_train_99, y_test_1 = split_cached(
                 self.X, self.y, test_size=0.01, random_state=42
             )
             
@@ -616,7 +643,7 @@ class TestSetContaminationDetector:
         
         # Test very small training set (99% test)
         try:
-            X_train_1, X_test_99, y_train_1, y_test_99 = train_test_split(
+            X_train_1, X_test_99, y_train_1, y_test_99 = split_cached(
                 self.X, self.y, test_size=0.99, random_state=42
             )
             
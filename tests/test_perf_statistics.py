@@ -0,0 +1,135 @@
+"""
+Performance Statistics Tests
+
+The change-point, rank-test and growth-fit helpers decide whether CI
+fails on a slowdown, so their false-alarm and detection behaviour is
+pinned here on synthetic series with known answers.
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis_cache import AnalysisCache  # noqa: E402
+from benchmark_detector_performance import (  # noqa: E402
+    fit_growth_exponent, mann_whitney_p, min_mann_whitney_p, nlogn_exponent
+)
+from perf_history import _best_split, detect_change_point, detect_trailing_slowdown  # noqa: E402
+
+
+def noisy_series(levels, seed=0, noise=0.02):
+    """Runs at the given levels with a few percent of gaussian noise"""
+    rng = random.Random(seed)
+    return [level * (1 + rng.gauss(0, noise)) for level in levels]
+
+
+class TestBestSplit:
+    """Welch statistic search over every split"""
+
+    def test_finds_clean_step(self):
+        split, statistic = _best_split([1.0] * 10 + [2.0] * 10, min_segment=3)
+        assert split == 10
+        assert statistic == float('inf')
+
+    def test_flat_series_has_zero_statistic(self):
+        assert _best_split([5.0] * 12, min_segment=3)[1] == 0.0
+
+
+class TestDetectChangePoint:
+    """Permutation-tested single step change"""
+
+    def test_step_is_located_and_significant(self):
+        values = noisy_series([10.0] * 15 + [13.0] * 15)
+        change_point = detect_change_point(values)
+        assert change_point['index'] == 15
+        assert change_point['p_value'] < 0.01
+        assert change_point['change'] == pytest.approx(0.3, abs=0.05)
+
+    def test_noise_is_not_significant(self):
+        change_point = detect_change_point(noisy_series([10.0] * 30, seed=3))
+        assert change_point['p_value'] > 0.01
+
+    def test_short_series_is_not_tested(self):
+        assert detect_change_point([1.0, 2.0, 3.0, 4.0, 5.0]) is None
+
+
+class TestDetectTrailingSlowdown:
+    """Steps too close to the end for a full segment"""
+
+    def test_two_slow_runs_are_significant(self):
+        values = noisy_series([10.0] * 27 + [14.0] * 2, seed=1)
+        assert detect_change_point(values)['p_value'] > 0.01
+        trailing = detect_trailing_slowdown(values, 2)
+        assert trailing['index'] == 27
+        assert trailing['p_value'] == pytest.approx(1 / math.comb(29, 2))
+        assert trailing['change'] == pytest.approx(0.4, abs=0.05)
+
+    def test_single_run_cannot_reach_alpha_in_short_window(self):
+        values = noisy_series([10.0] * 29 + [14.0], seed=1)
+        assert detect_trailing_slowdown(values, 1)['p_value'] == pytest.approx(1 / 30)
+
+    def test_fast_tail_is_not_a_slowdown(self):
+        values = noisy_series([10.0] * 27 + [7.0] * 2, seed=1)
+        assert detect_trailing_slowdown(values, 2)['p_value'] == 1.0
+
+
+class TestMannWhitney:
+    """Normal-approximation rank test used by --compare"""
+
+    def test_identical_samples(self):
+        assert mann_whitney_p([1.0, 2.0, 3.0], [1.0, 2.0, 3.0]) == pytest.approx(1.0)
+
+    def test_matches_scipy_asymptotic(self):
+        stats = pytest.importorskip('scipy.stats')
+        a = noisy_series([10.0] * 9, seed=4)
+        b = noisy_series([10.5] * 11, seed=5)
+        expected = stats.mannwhitneyu(a, b, alternative='two-sided', method='asymptotic',
+                                      use_continuity=False).pvalue
+        assert mann_whitney_p(a, b) == pytest.approx(expected)
+
+    def test_three_runs_cannot_reach_alpha(self):
+        assert min_mann_whitney_p(3, 3) > 0.01
+        assert min_mann_whitney_p(8, 8) < 0.01
+
+
+class TestGrowthExponent:
+    """Log-log least squares fit of detector scaling"""
+
+    def test_recovers_power_law(self):
+        sizes = [1000, 2000, 4000, 8000, 16000]
+        exponent, r_squared = fit_growth_exponent(sizes, [3e-9 * size ** 1.5 for size in sizes])
+        assert exponent == pytest.approx(1.5)
+        assert r_squared == pytest.approx(1.0)
+
+    def test_nlogn_slope_is_slightly_above_linear(self):
+        sizes = [1000, 32000]
+        exponent, _ = fit_growth_exponent(sizes, [size * math.log(size) for size in sizes])
+        assert exponent == pytest.approx(nlogn_exponent(sizes))
+        assert 1.0 < exponent < 1.15
+
+
+class TestAnalysisCacheEviction:
+    """Size-bounded least-recently-used eviction"""
+
+    class Detector:
+        version = '1'
+
+    def test_stays_under_limit_and_keeps_recently_used(self, tmp_path):
+        detector = self.Detector()
+        with AnalysisCache(tmp_path / 'cache.sqlite', max_bytes=4000) as cache:
+            cache.put('kept', detector, list(range(20)))
+            for index in range(200):
+                cache.put(f'file{index}', detector, [index] * 20)
+                assert cache.get('kept', detector) is not None
+            stats = cache.stats()
+
+        assert stats['total_bytes'] <= 4000
+        assert stats['entries'] < 201
+        with AnalysisCache(tmp_path / 'cache.sqlite', max_bytes=4000) as cache:
+            assert cache.get('kept', detector) == list(range(20))
+            assert cache.get('file0', detector) is None
@@ -0,0 +1,87 @@
+"""
+Scan Pre-filter Tests
+
+The byte-level import pre-screen decides which files are never parsed,
+so a missed import silently drops every finding in that file.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scan_project import imported_modules, may_trigger, trigger_modules  # noqa: E402
+
+
+class TestImportedModules:
+    """Import statements recognized on raw bytes"""
+
+    def test_plain_and_aliased_imports(self):
+        assert imported_modules(b"import numpy as np\nimport pandas\n") == {'numpy', 'pandas'}
+
+    def test_tab_separated_alias(self):
+        assert imported_modules(b"import numpy\tas np\n") == {'numpy'}
+
+    def test_tab_after_from_module(self):
+        assert imported_modules(b"from sklearn.model_selection\timport train_test_split\n") == {'sklearn'}
+
+    def test_multiple_imports_on_one_line(self):
+        assert imported_modules(b"import os, torch.nn as nn, sys\n") == {'os', 'torch', 'sys'}
+
+    def test_backslash_continuation(self):
+        assert imported_modules(b"import os, \\\n    sklearn\n") == {'os', 'sklearn'}
+
+    def test_backslash_continuation_with_crlf(self):
+        assert imported_modules(b"import os, \\\r\n    sklearn\r\n") == {'os', 'sklearn'}
+
+    def test_parenthesized_from_import_names_only_the_module(self):
+        source = b"from sklearn.metrics import (\n    accuracy_score,\n    f1_score,\n)\n"
+        assert imported_modules(source) == {'sklearn'}
+
+    def test_imported_names_are_not_modules(self):
+        assert imported_modules(b"from utils import torch, pandas\n") == {'utils'}
+
+    def test_indented_and_semicolon_imports(self):
+        source = b"def load():\n    import pandas as pd\nx = 1; import torch\n"
+        assert imported_modules(source) == {'pandas', 'torch'}
+
+    def test_relative_imports_are_ignored(self):
+        assert imported_modules(b"from . import helpers\nfrom .models import Net\n") == set()
+
+    def test_trailing_comment(self):
+        assert imported_modules(b"import pandas as pd  # dataframes\n") == {'pandas'}
+
+
+class TestMayTrigger:
+    """Files are only skipped when no detector can fire"""
+
+    def setup_method(self):
+        self.triggers = {'numpy', 'pandas', 'sklearn', 'torch'}
+
+    def test_ml_file_is_kept(self):
+        assert may_trigger(b"import os, \\\n    sklearn\n", self.triggers)
+
+    def test_plain_file_is_skipped(self):
+        assert not may_trigger(b"import os\nimport json\n", self.triggers)
+
+    def test_dynamic_import_is_kept(self):
+        assert may_trigger(b"torch = __import__('torch')\n", self.triggers)
+        assert may_trigger(b"import importlib\nnp = importlib.import_module('numpy')\n", self.triggers)
+
+    def test_star_import_is_kept(self):
+        assert may_trigger(b"from project.utils import *\n", self.triggers)
+        assert may_trigger(b"from .helpers import *\n", self.triggers)
+        assert may_trigger(b"from project.utils \\\n    import *\n", self.triggers)
+        assert may_trigger(b"if True:\n    from project.utils\timport *\n", self.triggers)
+
+    def test_named_import_of_star_is_not_a_star_import(self):
+        assert not may_trigger(b"from project.utils import star, multiply  # a * b\n", self.triggers)
+
+    def test_empty_triggers_keep_everything(self):
+        assert may_trigger(b"import os\n", set())
+
+    def test_unknown_detector_disables_prefilter(self):
+        class CustomDetector:
+            pass
+
+        assert trigger_modules([CustomDetector()]) == set()